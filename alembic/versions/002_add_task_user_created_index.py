@@ -0,0 +1,31 @@
+"""Add (user_id, created_at DESC) index on tasks
+
+Revision ID: 002_add_task_user_created_index
+Revises: 001_add_conversation_message_tables
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_add_task_user_created_index'
+down_revision: Union[str, None] = '001_add_conversation_message_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets task listings read a user's rows already ordered newest first
+    op.create_index(
+        'ix_task_user_created',
+        'tasks',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_user_created', table_name='tasks')
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""Default conversation and message timestamps to now() on the server
+
+Revision ID: 003_add_conversation_message_timestamp_defaults
+Revises: 002_add_task_user_created_index
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_conversation_message_timestamp_defaults'
+down_revision: Union[str, None] = '002_add_task_user_created_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Inserts no longer send these columns; the database fills them in
+    op.alter_column('conversation', 'created_at', server_default=sa.func.now())
+    op.alter_column('conversation', 'updated_at', server_default=sa.func.now())
+    op.alter_column('message', 'timestamp', server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    op.alter_column('message', 'timestamp', server_default=None)
+    op.alter_column('conversation', 'updated_at', server_default=None)
+    op.alter_column('conversation', 'created_at', server_default=None)
@@ -0,0 +1,32 @@
+"""Add (conversation_id, timestamp DESC, id DESC) index on message
+
+Revision ID: 004_add_message_conversation_timestamp_index
+Revises: 003_add_conversation_message_timestamp_defaults
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_message_conversation_timestamp_index'
+down_revision: Union[str, None] = '003_add_conversation_message_timestamp_defaults'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets chat history pages read a conversation's rows already ordered newest
+    # first; id matches the (timestamp, id) keyset cursor
+    op.create_index(
+        'ix_message_conv_ts',
+        'message',
+        ['conversation_id', sa.text('timestamp DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_message_conv_ts', table_name='message')
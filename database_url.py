@@ -0,0 +1,25 @@
+"""Database URL handling shared by the root app and src/ (builds no engine)."""
+
+from sqlalchemy.engine import make_url
+
+# libpq-only query parameters that asyncpg rejects as connect arguments
+_LIBPQ_ONLY_PARAMS = ("sslmode", "channel_binding")
+
+
+def to_async_url(url: str) -> str:
+    """Rewrite a sync database URL for its async driver (asyncpg or aiosqlite).
+
+    Accepts postgres:// as well as postgresql://. asyncpg does not accept
+    libpq-style query params, so sslmode/channel_binding are dropped (Neon adds
+    them); sslmode is carried over as asyncpg's own ssl param.
+    """
+    parsed = make_url(url)
+    backend = parsed.drivername.split("+", 1)[0]
+    if backend in ("postgres", "postgresql"):
+        query = {k: v for k, v in parsed.query.items() if k not in _LIBPQ_ONLY_PARAMS}
+        if "sslmode" in parsed.query:
+            query.setdefault("ssl", parsed.query["sslmode"])
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
@@ -1,13 +1,17 @@
 """Database configuration and session management supporting both PostgreSQL and SQLite."""
 
+import functools
 import os
 from typing import AsyncGenerator
 
 from dotenv import load_dotenv
+from sqlalchemy import text
 from sqlmodel import SQLModel, Session, create_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from database_url import to_async_url
+
 # Load environment variables
 load_dotenv()
 
@@ -18,48 +22,51 @@ if not DATABASE_URL:
     DATABASE_URL = "sqlite:///./todo_app.db"
     print(f"Warning: DATABASE_URL not set, using SQLite: {DATABASE_URL}")
 
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
 # Handle different database types
 if DATABASE_URL.startswith("sqlite"):
     # For SQLite, use aiosqlite
-    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///")
-    
     # Create async engine with connection pooling optimized for serverless
     async_engine = create_async_engine(
         ASYNC_DATABASE_URL,
         echo=False,
         pool_pre_ping=True,  # Verify connections before using
-        pool_size=1,  # Serverless functions are short-lived, use minimal pool
-        max_overflow=0,  # No overflow for serverless
+        pool_size=5,  # Let concurrent requests on a warm instance run in parallel
+        max_overflow=10,  # Absorb short bursts without queueing
+        pool_timeout=10,  # Fail fast instead of hanging when the pool is exhausted
         pool_recycle=300,  # Recycle connections after 5 minutes
         connect_args={"check_same_thread": False},
     )
 else:
-    # For PostgreSQL, use asyncpg
-    # Convert synchronous URL to async for PostgreSQL.
-    # NOTE: asyncpg does not accept libpq-style query params like `sslmode`.
-    # Neon requires SSL, so we drop those params and enable SSL via connect_args.
-    ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-
-    # Strip libpq params that break asyncpg
-    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("?sslmode=require&channel_binding=require", "")
-    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("&sslmode=require&channel_binding=require", "")
-    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("?sslmode=require", "")
-    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("&sslmode=require", "")
-    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("?channel_binding=require", "")
-    ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("&channel_binding=require", "")
+    # For PostgreSQL, use asyncpg. Neon requires SSL, so it is always enabled
+    # via connect_args.
+    # Prepared statement caches. Transaction-mode poolers (pgbouncer) can't use
+    # prepared statements, so they can be turned off explicitly via env.
+    if os.getenv("DISABLE_PREPARED_STATEMENTS") == "1":
+        STATEMENT_CACHE_SIZE = 0
+    else:
+        STATEMENT_CACHE_SIZE = 100
 
     # Create async engine with connection pooling optimized for serverless
     async_engine = create_async_engine(
         ASYNC_DATABASE_URL,
         echo=False,
         pool_pre_ping=True,  # Verify connections before using
-        pool_size=1,  # Serverless functions are short-lived, use minimal pool
-        max_overflow=0,  # No overflow for serverless
+        pool_size=5,  # Let concurrent requests on a warm instance run in parallel
+        max_overflow=10,  # Absorb short bursts without queueing
+        pool_timeout=10,  # Fail fast instead of hanging when the pool is exhausted
         pool_recycle=300,  # Recycle connections after 5 minutes
+        query_cache_size=1200,  # Keep compiled SQL for every statement the app issues
         connect_args={
             "ssl": True,
-            "server_settings": {"jit": "off"},  # Disable JIT for faster cold starts
+            "server_settings": {
+                "jit": "off",  # Disable JIT for faster cold starts
+                "statement_timeout": "10000",  # Abort queries running over 10 seconds
+            },
             "command_timeout": 10,  # 10 second timeout for commands
+            "statement_cache_size": STATEMENT_CACHE_SIZE,  # asyncpg's own cache
+            "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,  # SQLAlchemy adapter's cache
         },
     )
 
@@ -77,21 +84,43 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-# Also provide sync engine for migrations (Alembic)
-sync_engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-)
+async def check_connection() -> None:
+    """Run SELECT 1 on a pooled connection; raises if the database is unreachable.
+
+    Probes borrow from the app's pool, so repeated health checks reuse a warm
+    connection instead of paying for a fresh TCP/TLS handshake and login.
+    """
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+# Also provide sync engine for migrations (Alembic). Built lazily so the app's
+# cold start doesn't load the sync driver or open a pool it never uses.
+@functools.cache
+def get_sync_engine():
+    """Get the shared synchronous engine, creating it on first use."""
+    return create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_pre_ping=True,
+    )
 
 
 def get_sync_session() -> Session:
     """Get synchronous database session."""
-    with Session(sync_engine) as session:
+    with Session(get_sync_engine()) as session:
         yield session
 
 
+# Set once create_all has run so repeated calls in a warm process are free
+_initialized = False
+
+
 async def init_db():
-    """Initialize database tables."""
+    """Initialize database tables (local dev only; production uses Alembic)."""
+    global _initialized
+    if _initialized:
+        return
     async with async_engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+    _initialized = True
@@ -1,19 +1,37 @@
 """JWT token generation and verification utilities."""
 
+import hashlib
+import logging
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict
-from jose import JWTError, jwt
+from typing import Optional, Dict, Tuple
+import jwt
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # JWT Configuration
 # IMPORTANT: Both frontend and backend must use the SAME SECRET_KEY
 SECRET_KEY = os.getenv("SECRET_KEY", "same-secret-key-for-both-frontend-and-backend-dev-only")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))  # 7 days
 
+# Encode the secret once; PyJWT uses bytes keys as-is
+_SIGNING_KEY = SECRET_KEY.encode("utf-8")
+
+# Verification cache (LRU + TTL) so repeated requests with the same token
+# skip the signature check and payload decode
+TOKEN_CACHE_MAXSIZE = 10_000
+TOKEN_CACHE_TTL = 5.0  # seconds a verified token stays cached
+TOKEN_CACHE_NEGATIVE_TTL = 1.0  # seconds an invalid token stays cached
+
+# Maps blake2b(token) -> (expires_at, payload or None for invalid tokens)
+_token_cache: "OrderedDict[bytes, Tuple[float, Optional[Dict]]]" = OrderedDict()
+
 
 def create_access_token(user_id: str, email: str) -> str:
     """Create JWT access token for user."""
@@ -24,27 +42,60 @@ def create_access_token(user_id: str, email: str) -> str:
         "exp": expire,
         "iat": datetime.utcnow(),
     }
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[Dict]:
-    """Verify JWT token and return payload if valid."""
+def _verify_token_uncached(token: str) -> Tuple[Optional[Dict], Optional[float]]:
+    """Verify JWT token and return (payload, exp) if valid, (None, None) otherwise."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         email: str = payload.get("email")
         if user_id is None or email is None:
-            return None
-        return {"user_id": user_id, "email": email}
-    except JWTError as e:
+            return None, None
+        return {"user_id": user_id, "email": email}, payload.get("exp")
+    except jwt.PyJWTError as e:
         # Token is invalid (expired, wrong secret, malformed, etc.)
-        print(f"Token verification failed (JWTError): {e}")
-        return None
+        logger.debug("Token verification failed (PyJWTError): %s", e)
+        return None, None
     except Exception as e:
         # Any other unexpected error
-        print(f"Unexpected error during token verification: {e}")
-        return None
+        logger.warning("Unexpected error during token verification: %s", e)
+        return None, None
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash the token so cache memory stays bounded regardless of token size."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def verify_token(token: str) -> Optional[Dict]:
+    """Verify JWT token and return payload if valid."""
+    key = _token_cache_key(token)
+    now = time.time()
+
+    cached = _token_cache.get(key)
+    if cached is not None:
+        expires_at, payload = cached
+        if expires_at > now:
+            _token_cache.move_to_end(key)
+            return dict(payload) if payload is not None else None
+        del _token_cache[key]
+
+    payload, exp = _verify_token_uncached(token)
+    if payload is None:
+        ttl = TOKEN_CACHE_NEGATIVE_TTL
+    else:
+        # Never serve a token from cache past its own expiry
+        ttl = TOKEN_CACHE_TTL if exp is None else min(TOKEN_CACHE_TTL, exp - now)
+
+    if ttl > 0:
+        _token_cache[key] = (now + ttl, payload)
+        if len(_token_cache) > TOKEN_CACHE_MAXSIZE:
+            _token_cache.popitem(last=False)
+
+    return dict(payload) if payload is not None else None
 
 
 def decode_token(token: str) -> Optional[str]:
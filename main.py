@@ -1,17 +1,39 @@
 """Main FastAPI application for Todo Web App."""
 
-from fastapi import FastAPI
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 
-from db import init_db
+from db import async_engine, check_connection, init_db
 from routes.auth import router as auth_router
 from routes.tasks import router as tasks_router
 from routes.ai_assistant import router as ai_router
 
+# App loggers stay at WARNING unless LOG_LEVEL is set (e.g. LOG_LEVEL=DEBUG locally)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ensure tables exist for local dev. Skipped by default so serverless cold starts
+    # don't pay for table reflection; production schema is managed by Alembic.
+    if os.getenv("RUN_INIT_DB") == "1":
+        await init_db()
+    yield
+    # Close pooled connections cleanly instead of leaving them to the server to time out
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Todo API",
     description="Backend API for Phase II Todo Web Application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS for frontend
@@ -23,12 +45,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Ensure tables exist for local dev
-@app.on_event("startup")
-async def on_startup():
-    await init_db()
-
-
 # Include routers
 app.include_router(auth_router)
 app.include_router(tasks_router)
@@ -45,3 +61,17 @@ async def root():
 async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness check: verifies the database answers on a pooled connection."""
+    try:
+        await check_connection()
+    except Exception as e:
+        logger.warning("Readiness check failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
+        )
+    return {"status": "ready"}
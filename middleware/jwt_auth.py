@@ -1,10 +1,13 @@
 """JWT authentication middleware for protected routes."""
 
+import logging
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from jwt_utils import verify_token
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
 
@@ -28,14 +31,14 @@ async def get_current_user(
 ) -> dict:
     """Extract and verify user from JWT token."""
     token = credentials.credentials
-    print(f"DEBUG: Received token: {token[:50]}...")  # Log first 50 chars
+    logger.debug("Received token: %s...", token[:50])  # Log first 50 chars
     payload = verify_token(token)
     if payload is None:
-        print(f"DEBUG: Token verification failed for token: {token[:50]}...")
+        logger.debug("Token verification failed for token: %s...", token[:50])
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired authentication token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    print(f"DEBUG: Token verified successfully for user: {payload}")
+    logger.debug("Token verified successfully for user: %s", payload)
     return payload
@@ -1,13 +1,13 @@
 """Database migration script to create tables."""
 
 from models import SQLModel
-from db import sync_engine
+from db import get_sync_engine
 
 
 def main():
     """Create all database tables."""
     print("Creating database tables...")
-    SQLModel.metadata.create_all(sync_engine)
+    SQLModel.metadata.create_all(get_sync_engine())
     print("✓ Database tables created successfully!")
 
 
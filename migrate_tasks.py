@@ -9,51 +9,34 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Columns that older deployments of the tasks table may be missing
+COLUMNS_TO_ADD = [
+    ("status", "VARCHAR(20) DEFAULT 'pending'"),
+    ("completed", "BOOLEAN DEFAULT FALSE"),
+    ("due_date", "TIMESTAMP"),
+    ("priority", "VARCHAR(20) DEFAULT 'medium'"),
+    ("updated_at", "TIMESTAMP DEFAULT NOW()"),
+]
+
+
 async def migrate():
     """Add missing columns to tasks table."""
     from db import async_engine
-    
-    async with async_engine.connect() as conn:
-        # Get all existing columns
-        result = await conn.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'tasks'
-        """))
-        existing_columns = [row[0] for row in result.fetchall()]
-        
-        print(f"Existing columns: {existing_columns}")
-        
-        # Add missing columns
-        columns_to_add = []
-        
-        if 'status' not in existing_columns:
-            columns_to_add.append(("status", "VARCHAR(20) DEFAULT 'pending'"))
-        
-        if 'completed' not in existing_columns:
-            columns_to_add.append(("completed", "BOOLEAN DEFAULT FALSE"))
-        
-        if 'due_date' not in existing_columns:
-            columns_to_add.append(("due_date", "TIMESTAMP"))
-        
-        if 'priority' not in existing_columns:
-            columns_to_add.append(("priority", "VARCHAR(20) DEFAULT 'medium'"))
-        
-        if 'updated_at' not in existing_columns:
-            columns_to_add.append(("updated_at", "TIMESTAMP DEFAULT NOW()"))
-        
-        if not columns_to_add:
-            print("[OK] All columns already exist!")
-        else:
-            for col_name, col_type in columns_to_add:
-                print(f"Adding '{col_name}' column...")
-                await conn.execute(text(f"""
-                    ALTER TABLE tasks 
-                    ADD COLUMN {col_name} {col_type}
-                """))
-                await conn.commit()
-                print(f"[OK] '{col_name}' column added successfully!")
-    
+
+    # PostgreSQL accepts several ADD COLUMN clauses in one ALTER TABLE, and
+    # IF NOT EXISTS makes it safe to run without probing information_schema first
+    alter_sql = "ALTER TABLE tasks " + ", ".join(
+        f"ADD COLUMN IF NOT EXISTS {col_name} {col_type}"
+        for col_name, col_type in COLUMNS_TO_ADD
+    )
+
+    print(f"Ensuring columns exist: {[col_name for col_name, _ in COLUMNS_TO_ADD]}")
+
+    # engine.begin() commits once when the block exits
+    async with async_engine.begin() as conn:
+        await conn.execute(text(alter_sql))
+
+    print("[OK] All columns present!")
     print("\nMigration completed!")
 
 if __name__ == "__main__":
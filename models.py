@@ -1,7 +1,8 @@
 """SQLModel database models for Todo AI Chatbot."""
 
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Index, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Index, JSON, text
+from sqlalchemy.orm import relationship
 from typing import Optional, List
 from datetime import datetime
 import uuid
@@ -18,15 +19,24 @@ class User(SQLModel, table=True):
     name: Optional[str] = Field(default=None, max_length=255)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    # Relationship to tasks
-    tasks: List["Task"] = Relationship(back_populates="user")
-    conversations: List["Conversation"] = Relationship(back_populates="user")
+    # Relationship targets are module-qualified: src/models defines User,
+    # Conversation and Message classes in the same SQLModel registry
+    tasks: List["Task"] = Relationship(
+        sa_relationship=relationship("models.Task", back_populates="user")
+    )
+    conversations: List["Conversation"] = Relationship(
+        sa_relationship=relationship("models.Conversation", back_populates="user")
+    )
 
 
 class Task(SQLModel, table=True):
     """Task entity representing a todo item owned by a user."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Serves "a user's tasks, newest first" as an ordered index range scan
+        Index("ix_task_user_created", "user_id", text("created_at DESC")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(foreign_key="users.id", index=True)
@@ -41,7 +51,9 @@ class Task(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     # Relationship to user
-    user: Optional["User"] = Relationship(back_populates="tasks")
+    user: Optional["User"] = Relationship(
+        sa_relationship=relationship("models.User", back_populates="tasks")
+    )
 
     class Config:
         indexes = [
@@ -64,9 +76,15 @@ class Conversation(SQLModel, table=True):
     last_message_at: Optional[datetime] = Field(default=None)
 
     # Relationships
-    user: Optional["User"] = Relationship(back_populates="conversations")
-    messages: List["Message"] = Relationship(back_populates="conversation")
-    conversation_state: Optional["ConversationState"] = Relationship(back_populates="conversation")
+    user: Optional["User"] = Relationship(
+        sa_relationship=relationship("models.User", back_populates="conversations")
+    )
+    messages: List["Message"] = Relationship(
+        sa_relationship=relationship("models.Message", back_populates="conversation")
+    )
+    conversation_state: Optional["ConversationState"] = Relationship(
+        sa_relationship=relationship("models.ConversationState", back_populates="conversation", uselist=False)
+    )
 
     class Config:
         indexes = [
@@ -88,7 +106,9 @@ class Message(SQLModel, table=True):
     message_metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON))
 
     # Relationship to conversation
-    conversation: Optional["Conversation"] = Relationship(back_populates="messages")
+    conversation: Optional["Conversation"] = Relationship(
+        sa_relationship=relationship("models.Conversation", back_populates="messages")
+    )
 
     class Config:
         indexes = [
@@ -109,4 +129,6 @@ class ConversationState(SQLModel, table=True):
     version: int = Field(default=1)
 
     # Relationship to conversation
-    conversation: Optional["Conversation"] = Relationship(back_populates="conversation_state")
+    conversation: Optional["Conversation"] = Relationship(
+        sa_relationship=relationship("models.Conversation", back_populates="conversation_state")
+    )
@@ -1,18 +1,64 @@
 """AI Assistant routes for the Todo Web App."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from middleware.jwt_auth import get_current_user
-from sqlmodel import select
+from sqlmodel import select, func
+from sqlalchemy import insert, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 from db import get_session
 from models import Task
-from datetime import datetime
+import logging
 import re
+import time
 
 
-router = APIRouter(prefix="/ai", tags=["ai-assistant"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/ai", tags=["ai-assistant"], default_response_class=ORJSONResponse)
+
+# Number of tasks shown when the user asks to see their tasks
+LIST_PREVIEW_LIMIT = 5
+
+# Short-lived per-user task counts so repeated list/delete requests from users
+# with no (or few) tasks skip the database
+TASK_COUNT_CACHE_TTL = 10.0  # seconds
+TASK_COUNT_CACHE_MAXSIZE = 10_000
+
+# Maps user_id -> (expires_at, task_count)
+_task_count_cache: Dict[str, Tuple[float, int]] = {}
+
+# Intent patterns, compiled once at import. Patterns within a group are tried
+# in order, so an earlier pattern wins even if a later one matches further left.
+_CREATE_PATTERNS = [
+    r'add.*task.*to\s+(.+)',
+    r'create.*task.*to\s+(.+)',
+    r'add.*task\s+(.+)',
+    r'create.*task\s+(.+)',
+    r'new task\s+(.+)',
+    r'add\s+(.+)\s+to my tasks',
+]
+
+_DELETE_PATTERNS = [
+    r'delete.*task.*#?(\d+)',
+    r'remove.*task.*#?(\d+)',
+    r'del.*task.*#?(\d+)',
+    r'delete.*#?(\d+)',
+    r'remove.*#?(\d+)',
+    r'del.*#?(\d+)',
+    r'.*task.*del.*id.*?(\d+)',
+    r'.*del.*task.*id.*?(\d+)',
+]
+
+# Patterns are case-insensitive so the message never needs lower-casing
+_CREATE_RES = tuple(re.compile(p, re.IGNORECASE) for p in _CREATE_PATTERNS)
+_DELETE_RES = tuple(re.compile(p, re.IGNORECASE) for p in _DELETE_PATTERNS)
+_COMPLETE_RE = re.compile(r'mark.*task.*#?(\d+).*completed|complete.*task.*#?(\d+)', re.IGNORECASE)
+_LIST_RE = re.compile(r'show|list|view|see|my tasks', re.IGNORECASE)
+_GREETING_RE = re.compile(r'^(hello|hi|hey)', re.IGNORECASE)
+_CLEANUP_SUFFIX_RE = re.compile(r'\s*(to my tasks|for me|please|thanks)$', re.IGNORECASE)
 
 
 class AIRequest(BaseModel):
@@ -28,112 +74,184 @@ class AIResponse(BaseModel):
     task_id: Optional[int] = None
 
 
+def _get_cached_task_count(user_id: str) -> Optional[int]:
+    """Return the cached task count for a user, if still fresh."""
+    cached = _task_count_cache.get(user_id)
+    if cached is None:
+        return None
+    expires_at, count = cached
+    if expires_at <= time.time():
+        _task_count_cache.pop(user_id, None)
+        return None
+    return count
+
+
+def _set_cached_task_count(user_id: str, count: int) -> None:
+    """Cache a user's task count for TASK_COUNT_CACHE_TTL seconds."""
+    if user_id not in _task_count_cache and len(_task_count_cache) >= TASK_COUNT_CACHE_MAXSIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _task_count_cache.pop(next(iter(_task_count_cache)))
+    _task_count_cache[user_id] = (time.time() + TASK_COUNT_CACHE_TTL, count)
+
+
+def invalidate_task_count(user_id: str) -> None:
+    """Drop a user's cached task count; call after creating or deleting tasks."""
+    _task_count_cache.pop(user_id, None)
+
+
+def _task_id_at_position(user_id: str, task_num: int):
+    """Scalar subquery selecting the id of the user's task at 1-based position `task_num` (oldest first)."""
+    return (
+        select(Task.id)
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at.asc())
+        .offset(task_num - 1)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+async def _get_task_by_position(session: AsyncSession, user_id: str, task_num: int) -> Optional[Task]:
+    """Fetch the user's task at 1-based position `task_num` (oldest first) without loading the rest."""
+    if task_num < 1:
+        return None
+    return (await session.exec(
+        select(Task)
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at.asc())
+        .offset(task_num - 1)
+        .limit(1)
+    )).first()
+
+
+async def _handle_create(match: re.Match, user_id: str, session: AsyncSession) -> Optional[dict]:
+    """Create a task from the captured title."""
+    task_title = match.group(1).strip()
+    # Remove common words at the end
+    task_title = _CLEANUP_SUFFIX_RE.sub('', task_title).strip()
+
+    if not task_title:
+        # Nothing left to name the task; let later patterns and intents try the message
+        return None
+
+    # Actually create the task in database; RETURNING hands back the id
+    # without a follow-up SELECT
+    task_id = (await session.exec(
+        insert(Task)
+        .values(
+            user_id=user_id,
+            title=task_title.title(),
+            description=f"Task created via AI assistant",
+            status="pending",
+            completed=False,
+            priority="medium"
+        )
+        .returning(Task.id)
+    )).scalar_one()
+    await session.commit()
+    invalidate_task_count(user_id)
+
+    return {
+        "response": f"✓ Task created successfully: '{task_title.title()}'",
+        "task_created": True,
+        "task_id": task_id
+    }
+
+
+async def _handle_list(match: re.Match, user_id: str, session: AsyncSession) -> dict:
+    """Show a preview of the user's most recent tasks."""
+    if _get_cached_task_count(user_id) == 0:
+        return {"response": "You don't have any tasks yet. Want to add one?"}
+
+    # Only the rendered columns are selected, as plain mappings, so no ORM
+    # instances or attribute descriptors are involved
+    rows = (await session.exec(
+        select(Task.title, Task.completed)
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at.desc())
+        .limit(LIST_PREVIEW_LIMIT)
+    )).mappings().all()
+
+    if len(rows) < LIST_PREVIEW_LIMIT:
+        # A short page means we've seen every task, so the count is exact
+        _set_cached_task_count(user_id, len(rows))
+
+    if not rows:
+        return {"response": "You don't have any tasks yet. Want to add one?"}
+
+    task_list = "\n".join(f"{i+1}. {r['title']} - {'✓' if r['completed'] else '○'}" for i, r in enumerate(rows))
+    return {"response": f"Here are your tasks:\n{task_list}"}
+
+
+async def _handle_complete(match: re.Match, user_id: str, session: AsyncSession) -> dict:
+    """Mark the user's Nth task as completed."""
+    task_num = int(match.group(1) or match.group(2))
+    task_title = None
+    if task_num >= 1:
+        # Locate and update the row in one statement; the timestamp is set server-side
+        task_title = (await session.exec(
+            update(Task)
+            .where(Task.id == _task_id_at_position(user_id, task_num))
+            .values(completed=True, status="completed", updated_at=func.now())
+            .returning(Task.title)
+        )).scalar_one_or_none()
+
+    if task_title is not None:
+        await session.commit()
+        return {"response": f"✓ Marked task #{task_num} '{task_title}' as completed!"}
+    else:
+        return {"response": f"Task #{task_num} not found."}
+
+
+async def _handle_delete(match: re.Match, user_id: str, session: AsyncSession) -> dict:
+    """Delete the user's Nth task."""
+    task_num = int(match.group(1))
+    task_count = _get_cached_task_count(user_id)
+    task = None
+    if task_count is None or task_num <= task_count:
+        task = await _get_task_by_position(session, user_id, task_num)
+
+    if task:
+        await session.delete(task)
+        await session.commit()
+        invalidate_task_count(user_id)
+        return {"response": f"✓ Deleted task #{task_num} '{task.title}'"}
+    else:
+        if task_count is None:
+            task_count = (await session.exec(
+                select(func.count()).select_from(Task).where(Task.user_id == user_id)
+            )).one()
+            _set_cached_task_count(user_id, task_count)
+        return {"response": f"Task #{task_num} not found. You have {task_count} task(s)."}
+
+
+async def _handle_greeting(match: re.Match, user_id: str, session: AsyncSession) -> dict:
+    """Reply to a greeting with usage hints."""
+    return {"response": "Hello! I'm your AI assistant. Tell me to 'add a task to buy groceries' or 'show my tasks'!"}
+
+
+# Intents in priority order, each with its patterns in priority order; the
+# first pattern that matches and whose handler returns a response wins
+INTENT_DISPATCH = [
+    ("create", _CREATE_RES, _handle_create),
+    ("list", (_LIST_RE,), _handle_list),
+    ("complete", (_COMPLETE_RE,), _handle_complete),
+    ("delete", _DELETE_RES, _handle_delete),
+    ("greeting", (_GREETING_RE,), _handle_greeting),
+]
+
+
 async def get_ai_response(message: str, user_id: str, session: AsyncSession) -> dict:
     """
     AI response function that can actually create/manage tasks.
     """
-    lower_msg = message.lower()
-    
-    # Check for task creation intent
-    create_patterns = [
-        r'add.*task.*to\s+(.+)',
-        r'create.*task.*to\s+(.+)',
-        r'add.*task\s+(.+)',
-        r'create.*task\s+(.+)',
-        r'new task\s+(.+)',
-        r'add\s+(.+)\s+to my tasks',
-    ]
-    
-    for pattern in create_patterns:
-        match = re.search(pattern, lower_msg)
-        if match:
-            task_title = match.group(1).strip()
-            # Remove common words at the end
-            task_title = re.sub(r'\s*(to my tasks|for me|please|thanks)$', '', task_title).strip()
-            
-            if task_title:
-                # Actually create the task in database
-                new_task = Task(
-                    user_id=user_id,
-                    title=task_title.title(),
-                    description=f"Task created via AI assistant",
-                    status="pending",
-                    completed=False,
-                    priority="medium"
-                )
-                session.add(new_task)
-                await session.commit()
-                await session.refresh(new_task)
-                
-                return {
-                    "response": f"✓ Task created successfully: '{task_title.title()}'",
-                    "task_created": True,
-                    "task_id": new_task.id
-                }
-    
-    # Check for task listing intent
-    if any(word in lower_msg for word in ['show', 'list', 'view', 'see', 'my tasks']):
-        tasks = (await session.exec(
-            select(Task).where(Task.user_id == user_id).order_by(Task.created_at.desc())
-        )).all()
-        
-        if not tasks:
-            return {"response": "You don't have any tasks yet. Want to add one?"}
-        
-        task_list = "\n".join([f"{i+1}. {t.title} - {'✓' if t.completed else '○'}" for i, t in enumerate(tasks[:5])])
-        return {"response": f"Here are your tasks:\n{task_list}"}
-    
-    # Check for task completion intent
-    complete_match = re.search(r'mark.*task.*#?(\d+).*completed|complete.*task.*#?(\d+)', lower_msg)
-    if complete_match:
-        task_num = int(complete_match.group(1) or complete_match.group(2))
-        tasks = (await session.exec(
-            select(Task).where(Task.user_id == user_id).order_by(Task.created_at.asc())
-        )).all()
-        
-        if 0 < task_num <= len(tasks):
-            task = tasks[task_num - 1]
-            task.completed = True
-            task.status = "completed"
-            task.updated_at = datetime.utcnow()
-            session.add(task)
-            await session.commit()
-            return {"response": f"✓ Marked task #{task_num} '{task.title}' as completed!"}
-        else:
-            return {"response": f"Task #{task_num} not found."}
-    
-    # Check for task deletion intent (multiple patterns)
-    delete_patterns = [
-        r'delete.*task.*#?(\d+)',
-        r'remove.*task.*#?(\d+)',
-        r'del.*task.*#?(\d+)',
-        r'delete.*#?(\d+)',
-        r'remove.*#?(\d+)',
-        r'del.*#?(\d+)',
-        r'.*task.*del.*id.*?(\d+)',
-        r'.*del.*task.*id.*?(\d+)',
-    ]
-    
-    for pattern in delete_patterns:
-        delete_match = re.search(pattern, lower_msg)
-        if delete_match:
-            task_num = int(delete_match.group(1))
-            tasks = (await session.exec(
-                select(Task).where(Task.user_id == user_id).order_by(Task.created_at.asc())
-            )).all()
-            
-            if 0 < task_num <= len(tasks):
-                task = tasks[task_num - 1]
-                await session.delete(task)
-                await session.commit()
-                return {"response": f"✓ Deleted task #{task_num} '{task.title}'"}
-            else:
-                return {"response": f"Task #{task_num} not found. You have {len(tasks)} task(s)."}
-    
-    # Greeting
-    if lower_msg.startswith(('hello', 'hi', 'hey')):
-        return {"response": "Hello! I'm your AI assistant. Tell me to 'add a task to buy groceries' or 'show my tasks'!"}
-    
+    for _, patterns, handler in INTENT_DISPATCH:
+        for pattern in patterns:
+            if (match := pattern.search(message)):
+                result = await handler(match, user_id, session)
+                if result is not None:
+                    return result
+
     # Default response
     return {
         "response": f"I understand: '{message}'. Try saying: 'Add a task to buy groceries' or 'Show my tasks'"
@@ -157,23 +275,17 @@ async def chat_conversation(
         if not request.message or len(request.message.strip()) == 0:
             raise HTTPException(status_code=400, detail="Message is required")
 
-        # Extract user_id from current_user dict
-        print(f"DEBUG: current_user = {current_user}")
-        print(f"DEBUG: current_user keys = {current_user.keys()}")
-        print(f"DEBUG: current_user.get('user_id') = {current_user.get('user_id')}")
-        print(f"DEBUG: request.user_id = {request.user_id}")
-        
         # Always use user_id from current_user (JWT token), ignore request.user_id
         user_id = current_user.get("user_id") or current_user.get("sub")
-        
-        print(f"DEBUG: Using user_id: {user_id}")
-        
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("chat_conversation user=%s msg_len=%d", user_id, len(request.message))
+
         if not user_id:
             raise HTTPException(status_code=400, detail="User ID not found in token")
 
         # Get AI response (now with actual task management)
         result = await get_ai_response(request.message, user_id, session)
-        print(f"DEBUG: AI response result: {result}")
 
         # Format and return the response
         response = AIResponse(
@@ -188,9 +300,7 @@ async def chat_conversation(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"ERROR: Chat conversation failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Chat conversation failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
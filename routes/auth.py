@@ -1,8 +1,13 @@
 """Authentication routes for signup and login."""
 
+import os
 import re
+import anyio
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from fastapi import APIRouter, HTTPException, status, Depends
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from models import User
@@ -13,10 +18,22 @@ from typing import Optional
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
-# bcrypt has a 72-byte limit for passwords
-MAX_PASSWORD_LENGTH = 72
+# Upper bound on password length; Argon2 has no byte limit, this just keeps
+# request bodies reasonable
+MAX_PASSWORD_LENGTH = 128
 
-# Task reference: T026d (Fix bcrypt/passlib compatibility in backend)
+# Argon2id with the OWASP-recommended parameters (19 MiB, 2 iterations)
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1, hash_len=32)
+
+# Compiled once at import; \Z (unlike $) rejects a trailing newline
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+
+# Password hashing is CPU-bound, so it runs on worker threads instead of the
+# event loop. The limiter caps concurrent hashes at roughly one per core so a
+# burst of logins can't take every thread from the default pool.
+_password_hash_limiter = anyio.CapacityLimiter(
+    int(os.getenv("PASSWORD_HASH_THREADS", os.cpu_count() or 1))
+)
 
 
 # Pydantic models for validation
@@ -44,37 +61,35 @@ class TokenResponse(BaseModel):
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt.
-
-    Notes:
-    - bcrypt only uses the first 72 bytes of the password. We enforce this limit
-      to avoid silent truncation.
-
-    Task reference: T026d (Fix bcrypt/passlib compatibility in backend)
-    """
-    pw_bytes = password.encode("utf-8")
-    if len(pw_bytes) > MAX_PASSWORD_LENGTH:
-        raise ValueError(f"Password exceeds maximum length of {MAX_PASSWORD_LENGTH} bytes")
-
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(pw_bytes, salt).decode("utf-8")
+    """Hash a password using Argon2id (PHC string format)."""
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a bcrypt hash.
+    """Verify a password against an Argon2id hash, or a legacy bcrypt hash.
 
     Task reference: T026d (Fix bcrypt/passlib compatibility in backend)
     """
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"),
-        hashed_password.encode("utf-8"),
-    )
+    if hashed_password.startswith("$2"):
+        # Accounts created before the switch to Argon2 still hold bcrypt hashes
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
+        )
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash is bcrypt or uses outdated Argon2 parameters."""
+    return hashed_password.startswith("$2") or _password_hasher.check_needs_rehash(hashed_password)
 
 
 def validate_email(email: str) -> bool:
     """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
@@ -87,25 +102,10 @@ async def signup(user_data: UserCreate, session: AsyncSession = Depends(get_sess
             detail="Invalid email format"
         )
 
-    # Check if user already exists
-    existing_user = (await session.exec(
-        select(User).where(User.email == user_data.email)
-    )).first()
-
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
     # Create new user
-    try:
-        hashed_password = hash_password(user_data.password)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
+    hashed_password = await anyio.to_thread.run_sync(
+        hash_password, user_data.password, limiter=_password_hash_limiter
+    )
 
     new_user = User(
         email=user_data.email,
@@ -113,9 +113,18 @@ async def signup(user_data: UserCreate, session: AsyncSession = Depends(get_sess
         name=user_data.name
     )
 
+    # The unique index on email rejects duplicates, so there is no separate
+    # existence check; id and created_at are generated client-side, so no
+    # refresh is needed either
     session.add(new_user)
-    await session.commit()
-    await session.refresh(new_user)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     # Generate JWT token
     token = create_access_token(new_user.id, new_user.email)
@@ -146,12 +155,24 @@ async def login(user_data: UserLogin, session: AsyncSession = Depends(get_sessio
         )
 
     # Verify password
-    if not verify_password(user_data.password, user.password_hash):
+    password_ok = await anyio.to_thread.run_sync(
+        verify_password, user_data.password, user.password_hash,
+        limiter=_password_hash_limiter,
+    )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    # Upgrade bcrypt (or outdated Argon2) hashes now that we have the plaintext
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await anyio.to_thread.run_sync(
+            hash_password, user_data.password, limiter=_password_hash_limiter
+        )
+        session.add(user)
+        await session.commit()
+
     # Generate JWT token
     token = create_access_token(user.id, user.email)
 
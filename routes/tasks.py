@@ -1,17 +1,22 @@
 """Task CRUD routes for managing user tasks."""
 
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import ORJSONResponse
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import or_
+from sqlalchemy import or_, insert, update, delete, func
 from models import Task
 from db import get_session
 from middleware.jwt_auth import get_current_user_id
-from pydantic import BaseModel, constr, validator
+from routes.ai_assistant import invalidate_task_count
+from pydantic import BaseModel, ConfigDict, TypeAdapter, constr, validator
 from typing import Optional
 from datetime import datetime
 
-router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
+# Upper bound on tasks returned by list_tasks, newest first
+LIST_TASKS_LIMIT = 200
+
+router = APIRouter(prefix="/api/tasks", tags=["Tasks"], default_response_class=ORJSONResponse)
 
 
 # Pydantic models for validation
@@ -26,22 +31,49 @@ class TaskUpdate(BaseModel):
 
 
 class TaskResponse(BaseModel):
+    # Built straight from Task rows; datetimes are rendered as ISO 8601 on output
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     user_id: str
     title: str
     description: Optional[str] = None
     completed: bool
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 
-def validate_task_ownership(task: Task, user_id: str):
-    """Validate that task belongs to the authenticated user."""
-    if task.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Unauthorized: Task does not belong to this user"
-        )
+# Validate Task rows and dump them to JSON-ready data in pydantic-core
+_TASK_ADAPTER = TypeAdapter(TaskResponse)
+_TASK_LIST_ADAPTER = TypeAdapter(list[TaskResponse])
+
+
+def task_json_response(task: Task, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """Serialize one Task row into a response.
+
+    Returning a Response makes FastAPI skip its own response_model validation, so
+    each row is validated once; response_model stays on the route for the docs.
+    """
+    content = _TASK_ADAPTER.dump_python(_TASK_ADAPTER.validate_python(task), mode="json")
+    return ORJSONResponse(content, status_code=status_code)
+
+
+def task_list_json_response(tasks: list[Task]) -> ORJSONResponse:
+    """Serialize a list of Task rows into a response (see task_json_response)."""
+    content = _TASK_LIST_ADAPTER.dump_python(_TASK_LIST_ADAPTER.validate_python(tasks), mode="json")
+    return ORJSONResponse(content)
+
+
+def task_not_found() -> HTTPException:
+    """Error for a task that doesn't exist or belongs to another user.
+
+    Ownership is filtered in SQL, so both cases look the same and don't reveal
+    whether someone else's task id exists.
+    """
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Task not found"
+    )
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -51,26 +83,21 @@ async def create_task(
     user_id: str = Depends(get_current_user_id)
 ):
     """Create a new task for the authenticated user."""
-    new_task = Task(
-        user_id=user_id,
-        title=task_data.title,
-        description=task_data.description,
-        completed=False
-    )
-
-    session.add(new_task)
+    # RETURNING hands back the stored row (id, timestamps) without a refresh SELECT
+    new_task = (await session.exec(
+        insert(Task)
+        .values(
+            user_id=user_id,
+            title=task_data.title,
+            description=task_data.description,
+            completed=False
+        )
+        .returning(Task)
+    )).scalar_one()
     await session.commit()
-    await session.refresh(new_task)
-
-    return TaskResponse(
-        id=new_task.id,
-        user_id=new_task.user_id,
-        title=new_task.title,
-        description=new_task.description,
-        completed=new_task.completed,
-        created_at=new_task.created_at.isoformat(),
-        updated_at=new_task.updated_at.isoformat()
-    )
+    invalidate_task_count(user_id)
+
+    return task_json_response(new_task, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("", response_model=list[TaskResponse])
@@ -83,20 +110,10 @@ async def list_tasks(
         select(Task)
         .where(Task.user_id == user_id)
         .order_by(Task.created_at.desc())
+        .limit(LIST_TASKS_LIMIT)
     )).all()
 
-    return [
-        TaskResponse(
-            id=task.id,
-            user_id=task.user_id,
-            title=task.title,
-            description=task.description,
-            completed=task.completed,
-            created_at=task.created_at.isoformat(),
-            updated_at=task.updated_at.isoformat()
-        )
-        for task in tasks
-    ]
+    return task_list_json_response(tasks)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
@@ -106,25 +123,14 @@ async def get_task(
     user_id: str = Depends(get_current_user_id)
 ):
     """Get a specific task by ID."""
-    task = await session.get(Task, task_id)
+    task = (await session.exec(
+        select(Task).where(Task.id == task_id, Task.user_id == user_id)
+    )).first()
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
-    validate_task_ownership(task, user_id)
+    if task is None:
+        raise task_not_found()
 
-    return TaskResponse(
-        id=task.id,
-        user_id=task.user_id,
-        title=task.title,
-        description=task.description,
-        completed=task.completed,
-        created_at=task.created_at.isoformat(),
-        updated_at=task.updated_at.isoformat()
-    )
+    return task_json_response(task)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
@@ -135,37 +141,27 @@ async def update_task(
     user_id: str = Depends(get_current_user_id)
 ):
     """Update an existing task."""
-    task = await session.get(Task, task_id)
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
-    validate_task_ownership(task, user_id)
-
     # Update only provided fields
+    values = {}
     if task_update.title is not None:
-        task.title = task_update.title
+        values["title"] = task_update.title
     if task_update.description is not None:
-        task.description = task_update.description
+        values["description"] = task_update.description
 
-    task.updated_at = datetime.utcnow()
+    # Ownership is part of the WHERE clause, so this is a single round-trip
+    task = (await session.exec(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(**values, updated_at=func.now())
+        .returning(Task)
+    )).scalar_one_or_none()
+
+    if task is None:
+        raise task_not_found()
 
-    session.add(task)
     await session.commit()
-    await session.refresh(task)
-
-    return TaskResponse(
-        id=task.id,
-        user_id=task.user_id,
-        title=task.title,
-        description=task.description,
-        completed=task.completed,
-        created_at=task.created_at.isoformat(),
-        updated_at=task.updated_at.isoformat()
-    )
+
+    return task_json_response(task)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -175,18 +171,17 @@ async def delete_task(
     user_id: str = Depends(get_current_user_id)
 ):
     """Delete a task."""
-    task = await session.get(Task, task_id)
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+    deleted_id = (await session.exec(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .returning(Task.id)
+    )).scalar_one_or_none()
 
-    validate_task_ownership(task, user_id)
+    if deleted_id is None:
+        raise task_not_found()
 
-    session.delete(task)
     await session.commit()
+    invalidate_task_count(user_id)
 
 
 @router.patch("/{task_id}/complete", response_model=TaskResponse)
@@ -196,30 +191,16 @@ async def toggle_complete(
     user_id: str = Depends(get_current_user_id)
 ):
     """Toggle task completion status."""
-    task = await session.get(Task, task_id)
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
-    validate_task_ownership(task, user_id)
+    task = (await session.exec(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(completed=~Task.completed, updated_at=func.now())
+        .returning(Task)
+    )).scalar_one_or_none()
 
-    # Toggle completion status
-    task.completed = not task.completed
-    task.updated_at = datetime.utcnow()
+    if task is None:
+        raise task_not_found()
 
-    session.add(task)
     await session.commit()
-    await session.refresh(task)
-
-    return TaskResponse(
-        id=task.id,
-        user_id=task.user_id,
-        title=task.title,
-        description=task.description,
-        completed=task.completed,
-        created_at=task.created_at.isoformat(),
-        updated_at=task.updated_at.isoformat()
-    )
+
+    return task_json_response(task)
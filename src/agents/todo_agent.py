@@ -3,9 +3,10 @@ Enhanced AI Agent for Todo Chatbot
 Integrates with MCP tools to perform task management operations with improved intent recognition and confirmation handling
 """
 
+import functools
 import os
-from typing import Dict, Any, List
-from openai import OpenAI
+from typing import Dict, Any, AsyncIterator, List
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
 
@@ -18,8 +19,129 @@ class ToolCall(BaseModel):
 class TodoAgent:
     """AI Agent that manages todo tasks using MCP tools with enhanced intent recognition and confirmation handling"""
     
+    # Using a more cost-effective model
+    MODEL = "gpt-4o-mini"
+
+    # Tool schemas are static, so they are built once per process rather than per chat() call
+    TOOLS: List[Dict[str, Any]] = [
+        {
+            "type": "function",
+            "function": {
+                "name": "create_task",
+                "description": "Create a new task with a title and optional description",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "title": {
+                            "type": "string",
+                            "description": "The title of the task"
+                        },
+                        "description": {
+                            "type": "string",
+                            "description": "The description of the task"
+                        },
+                        "owner_id": {
+                            "type": "string",
+                            "description": "The ID of the user who owns the task"
+                        }
+                    },
+                    "required": ["title", "owner_id"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_tasks",
+                "description": "Get all tasks for a user, optionally filtered by status",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "owner_id": {
+                            "type": "string",
+                            "description": "The ID of the user whose tasks to retrieve"
+                        },
+                        "status": {
+                            "type": "string",
+                            "description": "Filter tasks by status (completed, pending, or all)",
+                            "enum": ["completed", "pending", "all"]
+                        }
+                    },
+                    "required": ["owner_id"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "update_task",
+                "description": "Update an existing task",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "id": {
+                            "type": "integer",
+                            "description": "The ID of the task to update"
+                        },
+                        "title": {
+                            "type": "string",
+                            "description": "The new title of the task"
+                        },
+                        "description": {
+                            "type": "string",
+                            "description": "The new description of the task"
+                        },
+                        "is_completed": {
+                            "type": "boolean",
+                            "description": "Whether the task is completed"
+                        },
+                        "owner_id": {
+                            "type": "string",
+                            "description": "The ID of the user who owns the task"
+                        }
+                    },
+                    "required": ["id"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "delete_task",
+                "description": "Delete a task by ID. This will prompt for confirmation.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "id": {
+                            "type": "integer",
+                            "description": "The ID of the task to delete"
+                        }
+                    },
+                    "required": ["id"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "complete_task",
+                "description": "Mark a task as completed",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "id": {
+                            "type": "integer",
+                            "description": "The ID of the task to mark as completed"
+                        }
+                    },
+                    "required": ["id"]
+                }
+            }
+        }
+    ]
+
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.system_prompt = """
         You are a helpful assistant that manages todo tasks. You can create, read, update, and delete tasks using the provided tools. 
         Always confirm destructive actions like deleting tasks before proceeding.
@@ -40,124 +162,9 @@ class TodoAgent:
         """
         Define the available tools for the AI agent
         """
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "create_task",
-                    "description": "Create a new task with a title and optional description",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "title": {
-                                "type": "string",
-                                "description": "The title of the task"
-                            },
-                            "description": {
-                                "type": "string",
-                                "description": "The description of the task"
-                            },
-                            "owner_id": {
-                                "type": "string",
-                                "description": "The ID of the user who owns the task"
-                            }
-                        },
-                        "required": ["title", "owner_id"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_tasks",
-                    "description": "Get all tasks for a user, optionally filtered by status",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "owner_id": {
-                                "type": "string",
-                                "description": "The ID of the user whose tasks to retrieve"
-                            },
-                            "status": {
-                                "type": "string",
-                                "description": "Filter tasks by status (completed, pending, or all)",
-                                "enum": ["completed", "pending", "all"]
-                            }
-                        },
-                        "required": ["owner_id"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "update_task",
-                    "description": "Update an existing task",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "id": {
-                                "type": "integer",
-                                "description": "The ID of the task to update"
-                            },
-                            "title": {
-                                "type": "string",
-                                "description": "The new title of the task"
-                            },
-                            "description": {
-                                "type": "string",
-                                "description": "The new description of the task"
-                            },
-                            "is_completed": {
-                                "type": "boolean",
-                                "description": "Whether the task is completed"
-                            },
-                            "owner_id": {
-                                "type": "string",
-                                "description": "The ID of the user who owns the task"
-                            }
-                        },
-                        "required": ["id"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "delete_task",
-                    "description": "Delete a task by ID. This will prompt for confirmation.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "id": {
-                                "type": "integer",
-                                "description": "The ID of the task to delete"
-                            }
-                        },
-                        "required": ["id"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "complete_task",
-                    "description": "Mark a task as completed",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "id": {
-                                "type": "integer",
-                                "description": "The ID of the task to mark as completed"
-                            }
-                        },
-                        "required": ["id"]
-                    }
-                }
-            }
-        ]
+        return self.TOOLS
     
-    def chat(self, messages: List[Dict[str, str]], tools: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def chat(self, messages: List[Dict[str, str]], tools: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Process a chat interaction with the AI agent
         """
@@ -165,8 +172,8 @@ class TodoAgent:
         if tools is None:
             tools = self.get_available_tools()
             
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",  # Using a more cost-effective model
+        response = await self.client.chat.completions.create(
+            model=self.MODEL,
             messages=[
                 {"role": "system", "content": self.system_prompt},
             ] + messages,
@@ -174,4 +181,29 @@ class TodoAgent:
             tool_choice="auto"
         )
         
-        return response.choices[0].model_dump()
\ No newline at end of file
+        return response.choices[0].model_dump()
+
+    async def chat_stream(self, messages: List[Dict[str, str]], tools: List[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+        """
+        Process a chat interaction with the AI agent, yielding completion chunks as they arrive
+        """
+        if tools is None:
+            tools = self.get_available_tools()
+
+        stream = await self.client.chat.completions.create(
+            model=self.MODEL,
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+            ] + messages,
+            tools=tools,
+            tool_choice="auto",
+            stream=True
+        )
+        async for chunk in stream:
+            yield chunk
+
+
+@functools.cache
+def get_todo_agent() -> TodoAgent:
+    """Return the process-wide agent, so its AsyncOpenAI client and connection pool are reused."""
+    return TodoAgent()
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from ..core.security import verify_token
+from ..core.security import is_token_revoked, revoke_token, verify_token
 from typing import Annotated
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_current_user_token(token: Annotated[str, Depends(oauth2_scheme)]):
+async def get_current_user_token(token: Annotated[str, Depends(oauth2_scheme)]):
     payload = verify_token(token)
-    if not payload:
+    if not payload or await is_token_revoked(token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -19,3 +19,16 @@ def get_current_user_token(token: Annotated[str, Depends(oauth2_scheme)]):
 @router.get("/whoami")
 def read_users_me(token_payload: Annotated[dict, Depends(get_current_user_token)]):
     return token_payload
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    token_payload: Annotated[dict, Depends(get_current_user_token)]
+):
+    # Revocation lives in Redis so every worker sees it; without Redis the
+    # token cannot be revoked, and logout says so rather than reporting success
+    if not await revoke_token(token, token_payload):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token revocation is unavailable",
+        )
@@ -4,19 +4,22 @@ Implements the stateless chat endpoint that connects the frontend to the AI agen
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlmodel import Session
-from typing import Dict, Any, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import uuid
 import logging
+import orjson
 
+from ..core.cache import commit
 from ..models.message import Message
 from ..models.conversation import Conversation
 from ..services.conversation_service import ConversationService
 from ..services.message_service import MessageService
 from ..tools.task_tools import TaskTools
-from ..agents.todo_agent import TodoAgent
-from ...database import engine
+from ..agents.todo_agent import get_todo_agent
+from db import get_session
 
 # Import Better Auth dependencies
 from auth import get_current_user  # Assuming this is how Better Auth is integrated
@@ -25,7 +28,157 @@ from auth import get_current_user  # Assuming this is how Better Auth is integra
 logger = logging.getLogger(__name__)
 
 
-router = APIRouter(prefix="/chat", tags=["chat"])
+# Number of most recent messages sent to the AI agent as context, so prompt
+# size stays bounded as a conversation grows
+CHAT_HISTORY_LIMIT = 20
+
+AGENT_ERROR_RESPONSE = "Sorry, I'm having trouble processing your request right now. Please try again."
+NO_CONTENT_RESPONSE = "I processed your request, but there was an issue generating a response."
+
+router = APIRouter(prefix="/chat", tags=["chat"], default_response_class=ORJSONResponse)
+
+
+async def _start_turn(
+    session: AsyncSession,
+    conversation_id: Optional[str],
+    user_id: Optional[str],
+    message: str
+) -> Tuple[Conversation, List[Dict[str, str]]]:
+    """Load or create the conversation, store the user's message and build the agent history."""
+    conversation_service = ConversationService()
+    message_service = MessageService()
+
+    # Get or create conversation
+    if conversation_id:
+        # Retrieve existing conversation
+        conversation = await conversation_service.get_conversation(session, conversation_id)
+        if not conversation:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        
+        # Verify that the conversation belongs to the current user
+        if conversation.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Access denied")
+    else:
+        # Create new conversation
+        conversation = await conversation_service.create_conversation(
+            session, 
+            user_id=user_id,
+            title=f"Chatbot Conversation {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        )
+        conversation_id = conversation.id
+    
+    # Store the user's message. It is committed on its own so no transaction
+    # stays open across the AI agent call.
+    await message_service.create_message(
+        session,
+        conversation_id=conversation_id,
+        role="user",
+        content=message
+    )
+    await commit(session)
+    
+    # Prepare messages for the AI agent (last N messages for context). The
+    # user's message was stored above, so it is already the newest entry.
+    latest_messages = await message_service.get_latest_messages(
+        session, conversation_id, limit=CHAT_HISTORY_LIMIT
+    )
+    chat_history = [
+        {"role": msg.role, "content": msg.content}
+        for msg in reversed(latest_messages)
+    ]
+    return conversation, chat_history
+
+
+async def _run_tool_calls(
+    session: AsyncSession,
+    tool_calls: List[Dict[str, Any]],
+    owner_id: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Execute the agent's tool calls.
+
+    Returns the tool outputs, plus the pending action if a tool asked for
+    confirmation (in which case execution stops there).
+    """
+    task_tools = TaskTools(session)
+    tool_responses = []
+    for tool_call in tool_calls:
+        tool_name = tool_call['function']['name']
+        try:
+            tool_args = orjson.loads(tool_call['function']['arguments'])
+        except orjson.JSONDecodeError:
+            logger.warning("Invalid JSON arguments for tool call %s: %s", tool_name, tool_call['function']['arguments'])
+            tool_responses.append({
+                "tool_call_id": tool_call['id'],
+                "output": {"error": "Invalid arguments for tool call", "details": "The arguments provided could not be parsed as valid JSON."}
+            })
+            continue
+        
+        # Add user_id to tool arguments to ensure proper authorization
+        tool_args['owner_id'] = owner_id
+        
+        # Call the appropriate tool
+        tool_method = task_tools.dispatch.get(tool_name)
+        if tool_method is not None:
+            try:
+                result = await tool_method(**tool_args)
+                
+                # Handle confirmation requests
+                if result.get('requires_confirmation'):
+                    await commit(session)
+                    return tool_responses, {
+                        "message": result.get('message', 'Confirmation required'),
+                        "tool_name": tool_name,
+                        "tool_args": tool_args
+                    }
+                
+                tool_responses.append({
+                    "tool_call_id": tool_call['id'],
+                    "output": result
+                })
+            except Exception as e:
+                logger.error("Error executing tool %s: %s", tool_name, e)
+                tool_responses.append({
+                    "tool_call_id": tool_call['id'],
+                    "output": {
+                        "error": f"Error executing {tool_name}",
+                        "details": str(e)
+                    }
+                })
+        else:
+            logger.warning("Unknown tool called: %s", tool_name)
+            tool_responses.append({
+                "tool_call_id": tool_call['id'],
+                "output": {
+                    "error": f"Unknown tool: {tool_name}",
+                    "details": "The requested operation is not supported."
+                }
+            })
+    # The task services only flush, so tool writes are committed together here
+    await commit(session)
+    return tool_responses, None
+
+
+async def _finish_turn(session: AsyncSession, conversation: Conversation, final_response: str, now: datetime) -> None:
+    """Store the AI's response and bump the conversation timestamp to `now` in a single commit."""
+    await MessageService().create_message(
+        session,
+        conversation_id=conversation.id,
+        role="assistant",
+        content=final_response
+    )
+    conversation.updated_at = now
+    try:
+        await commit(session)
+    except Exception as e:
+        logger.error("Error storing AI response: %s", e)
+        await session.rollback()
+        # Continue execution even if we can't store the message
+
+
+def _sse(event: Dict[str, Any]) -> bytes:
+    """Encode one server-sent event."""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
 
 
 @router.post("/conversation")
@@ -33,169 +186,162 @@ async def chat_conversation(
     request: Request,
     message: str,
     conversation_id: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)  # Authentication check
+    current_user: dict = Depends(get_current_user),  # Authentication check
+    session: AsyncSession = Depends(get_session)
 ) -> Dict[str, Any]:
     """
     Initiates a new conversation or continues an existing one.
     This is a stateless endpoint that handles the chat interaction.
     """
-    # Get database session
-    with Session(engine) as session:
-        # Initialize services
-        conversation_service = ConversationService()
-        message_service = MessageService()
-        task_tools = TaskTools(session)
-        agent = TodoAgent()
-        
-        # Get or create conversation
-        if conversation_id:
-            # Retrieve existing conversation
-            conversation = conversation_service.get_conversation(session, conversation_id)
-            if not conversation:
-                raise HTTPException(status_code=404, detail="Conversation not found")
-            
-            # Verify that the conversation belongs to the current user
-            if conversation.user_id != current_user.get("id"):
-                raise HTTPException(status_code=403, detail="Access denied")
-        else:
-            # Create new conversation
-            conversation = conversation_service.create_conversation(
-                session, 
-                user_id=current_user.get("id"),
-                title=f"Chatbot Conversation {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-            )
-            conversation_id = conversation.id
-        
-        # Store the user's message
-        user_message = message_service.create_message(
-            session,
-            conversation_id=conversation_id,
-            role="user",
-            content=message
+    agent = get_todo_agent()
+    conversation, chat_history = await _start_turn(
+        session, conversation_id, current_user.get("id"), message
+    )
+    conversation_id = conversation.id
+    
+    try:
+        # Get response from AI agent
+        agent_response = await agent.chat(chat_history)
+    except Exception as e:
+        logger.error("Error getting response from AI agent: %s", e)
+        return {
+            "conversation_id": conversation_id,
+            "response": AGENT_ERROR_RESPONSE,
+            "actions_taken": [],
+            "requires_confirmation": False,
+            "timestamp": datetime.now()
+        }
+    
+    # Process tool calls if any
+    tool_responses = []
+    if 'tool_calls' in agent_response.get('choices', [{}])[0]:
+        tool_responses, confirmation = await _run_tool_calls(
+            session, agent_response['choices'][0]['tool_calls'], current_user.get("id")
         )
-        
-        # Prepare messages for the AI agent (last N messages for context)
-        # In a real implementation, you might want to limit the context window
-        all_messages = message_service.get_messages_by_conversation(session, conversation_id)
-        chat_history = []
-        for msg in all_messages:
-            chat_history.append({
-                "role": msg.role,
-                "content": msg.content
-            })
-        
-        # Add the current user message
-        chat_history.append({
-            "role": "user",
-            "content": message
-        })
-        
-        try:
-            # Get response from AI agent
-            agent_response = agent.chat(chat_history)
-        except Exception as e:
-            logger.error(f"Error getting response from AI agent: {str(e)}")
+        if confirmation:
             return {
                 "conversation_id": conversation_id,
-                "response": "Sorry, I'm having trouble processing your request right now. Please try again.",
+                "response": confirmation["message"],
                 "actions_taken": [],
-                "requires_confirmation": False,
-                "timestamp": datetime.now().isoformat()
+                "requires_confirmation": True,
+                "confirm_action": {
+                    "tool_name": confirmation["tool_name"],
+                    "tool_args": confirmation["tool_args"]
+                },
+                "timestamp": datetime.now()
             }
-        
-        # Process tool calls if any
-        import json
-        tool_responses = []
-        if 'tool_calls' in agent_response.get('choices', [{}])[0]:
-            for tool_call in agent_response['choices'][0]['tool_calls']:
-                tool_name = tool_call['function']['name']
-                try:
-                    tool_args = json.loads(tool_call['function']['arguments'])
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON arguments for tool call {tool_name}: {tool_call['function']['arguments']}")
-                    tool_responses.append({
-                        "tool_call_id": tool_call['id'],
-                        "output": {"error": "Invalid arguments for tool call", "details": "The arguments provided could not be parsed as valid JSON."}
-                    })
-                    continue
-                
-                # Add user_id to tool arguments to ensure proper authorization
-                tool_args['owner_id'] = current_user.get("id")
-                
-                # Call the appropriate tool
-                if hasattr(task_tools, tool_name):
-                    try:
-                        tool_method = getattr(task_tools, tool_name)
-                        result = tool_method(**tool_args)
-                        
-                        # Handle confirmation requests
-                        if result.get('requires_confirmation'):
-                            return {
-                                "conversation_id": conversation_id,
-                                "response": result.get('message', 'Confirmation required'),
-                                "actions_taken": [],
-                                "requires_confirmation": True,
-                                "confirm_action": {
-                                    "tool_name": tool_name,
-                                    "tool_args": tool_args
-                                },
-                                "timestamp": datetime.now().isoformat()
-                            }
-                        
-                        tool_responses.append({
-                            "tool_call_id": tool_call['id'],
-                            "output": result
-                        })
-                    except Exception as e:
-                        logger.error(f"Error executing tool {tool_name}: {str(e)}")
-                        tool_responses.append({
-                            "tool_call_id": tool_call['id'],
-                            "output": {
-                                "error": f"Error executing {tool_name}",
-                                "details": str(e)
-                            }
-                        })
-                else:
-                    logger.warning(f"Unknown tool called: {tool_name}")
-                    tool_responses.append({
-                        "tool_call_id": tool_call['id'],
-                        "output": {
-                            "error": f"Unknown tool: {tool_name}",
-                            "details": "The requested operation is not supported."
-                        }
-                    })
-        
-        # Get the final response from the agent after processing tools
-        try:
-            final_response = agent_response['choices'][0]['message']['content']
-        except KeyError:
-            logger.warning("AI agent response did not contain expected message content")
-            final_response = "I processed your request, but there was an issue generating a response."
-        
-        # Store the AI's response
+    
+    # Get the final response from the agent after processing tools
+    try:
+        final_response = agent_response['choices'][0]['message']['content']
+    except KeyError:
+        logger.warning("AI agent response did not contain expected message content")
+        final_response = NO_CONTENT_RESPONSE
+    
+    # One timestamp for the stored update and the response
+    now = datetime.now()
+    await _finish_turn(session, conversation, final_response, now)
+    
+    # Return the response
+    return {
+        "conversation_id": conversation_id,
+        "response": final_response,
+        "actions_taken": tool_responses,
+        "requires_confirmation": False,
+        "timestamp": now
+    }
+
+
+@router.post("/conversation/stream")
+async def chat_conversation_stream(
+    request: Request,
+    message: str,
+    conversation_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),  # Authentication check
+    session: AsyncSession = Depends(get_session)
+) -> StreamingResponse:
+    """
+    Same as /conversation, but streams the reply as server-sent events.
+
+    Events are JSON objects with a "type": "token" for each piece of text as
+    the model produces it, then "actions" (tool outputs) or "confirmation",
+    and finally "done". Tool calls are buffered from the stream and run once
+    it ends.
+    """
+    agent = get_todo_agent()
+    conversation, chat_history = await _start_turn(
+        session, conversation_id, current_user.get("id"), message
+    )
+    conversation_id = conversation.id
+
+    async def events():
+        content_parts = []
+        # Tool calls arrive as deltas keyed by index; names and arguments are
+        # split across chunks and concatenated here
+        tool_calls: Dict[int, Dict[str, Any]] = {}
         try:
-            ai_message = message_service.create_message(
-                session,
-                conversation_id=conversation_id,
-                role="assistant",
-                content=final_response
-            )
+            async for chunk in agent.chat_stream(chat_history):
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield _sse({"type": "token", "content": delta.content})
+                for tool_delta in delta.tool_calls or ():
+                    call = tool_calls.setdefault(
+                        tool_delta.index, {"id": None, "function": {"name": "", "arguments": ""}}
+                    )
+                    if tool_delta.id:
+                        call["id"] = tool_delta.id
+                    if tool_delta.function:
+                        call["function"]["name"] += tool_delta.function.name or ""
+                        call["function"]["arguments"] += tool_delta.function.arguments or ""
         except Exception as e:
-            logger.error(f"Error storing AI response: {str(e)}")
-            # Continue execution even if we can't store the message
-        
-        # Update conversation timestamp
-        conversation.updated_at = datetime.now()
-        conversation_service.update_conversation(session, conversation)
-        
-        # Return the response
-        return {
+            logger.error("Error getting response from AI agent: %s", e)
+            yield _sse({
+                "type": "error",
+                "conversation_id": conversation_id,
+                "response": AGENT_ERROR_RESPONSE,
+                "timestamp": datetime.now()
+            })
+            return
+
+        tool_responses = []
+        if tool_calls:
+            tool_responses, confirmation = await _run_tool_calls(
+                session, [tool_calls[i] for i in sorted(tool_calls)], current_user.get("id")
+            )
+            if confirmation:
+                yield _sse({
+                    "type": "confirmation",
+                    "conversation_id": conversation_id,
+                    "response": confirmation["message"],
+                    "requires_confirmation": True,
+                    "confirm_action": {
+                        "tool_name": confirmation["tool_name"],
+                        "tool_args": confirmation["tool_args"]
+                    },
+                    "timestamp": datetime.now()
+                })
+                return
+            yield _sse({"type": "actions", "actions_taken": tool_responses})
+
+        final_response = "".join(content_parts)
+        if not final_response:
+            final_response = NO_CONTENT_RESPONSE
+            yield _sse({"type": "token", "content": final_response})
+
+        # Persist the full text once the stream has finished
+        now = datetime.now()
+        await _finish_turn(session, conversation, final_response, now)
+        yield _sse({
+            "type": "done",
             "conversation_id": conversation_id,
-            "response": final_response,
-            "actions_taken": tool_responses,
             "requires_confirmation": False,
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": now
+        })
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 @router.get("/conversations")
@@ -203,75 +349,86 @@ async def get_user_conversations(
     user_id: str,  # This would come from authentication
     page: int = 1,
     limit: int = 20,
-    active_only: bool = False
+    active_only: bool = False,
+    session: AsyncSession = Depends(get_session)
 ) -> Dict[str, Any]:
     """
     Retrieves a list of user's conversations.
     """
-    with Session(engine) as session:
-        conversation_service = ConversationService()
-        try:
-            conversations = conversation_service.get_user_conversations(
-                session, 
-                user_id, 
-                active_only=active_only
-            )
-        except Exception as e:
-            logger.error(f"Error retrieving conversations for user {user_id}: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving conversations")
-        
-        # Paginate results
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_conversations = conversations[start_idx:end_idx]
-        
-        conversation_list = []
-        for conv in paginated_conversations:
-            conversation_list.append({
-                "id": conv.id,
-                "title": conv.title,
-                "created_at": conv.created_at.isoformat(),
-                "updated_at": conv.updated_at.isoformat(),
-                "is_active": conv.is_active
-            })
-        
-        return {
-            "conversations": conversation_list,
-            "pagination": {
-                "page": page,
-                "limit": limit,
-                "total": len(conversations),
-                "has_more": end_idx < len(conversations)
-            }
+    conversation_service = ConversationService()
+    # Only the requested page is fetched; the total comes from a COUNT
+    offset = max(page - 1, 0) * limit
+    try:
+        conversations = await conversation_service.get_user_conversations(
+            session, 
+            user_id, 
+            active_only=active_only,
+            limit=limit,
+            offset=offset
+        )
+        total = await conversation_service.count_user_conversations(
+            session, user_id, active_only=active_only
+        )
+    except Exception as e:
+        logger.error("Error retrieving conversations for user %s: %s", user_id, e)
+        raise HTTPException(status_code=500, detail="Error retrieving conversations")
+    
+    conversation_list = []
+    for conv in conversations:
+        conversation_list.append({
+            "id": conv.id,
+            "title": conv.title,
+            "created_at": conv.created_at,
+            "updated_at": conv.updated_at,
+            "is_active": conv.is_active
+        })
+    
+    return {
+        "conversations": conversation_list,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "has_more": offset + len(conversations) < total
         }
+    }
 
 
 @router.get("/conversations/{conversation_id}/messages")
 async def get_conversation_messages(
     conversation_id: str,
-    limit: int = 50
+    limit: int = 50,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+    session: AsyncSession = Depends(get_session)
 ) -> Dict[str, Any]:
     """
-    Retrieves messages for a specific conversation.
+    Retrieves messages for a specific conversation, newest first.
+
+    Pass the timestamp and id of the oldest message received as `before` and
+    `before_id` to load the previous page.
     """
-    with Session(engine) as session:
-        message_service = MessageService()
-        try:
-            messages = message_service.get_latest_messages(session, conversation_id, limit)
-        except Exception as e:
-            logger.error(f"Error retrieving messages for conversation {conversation_id}: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving conversation messages")
-        
-        message_list = []
-        for msg in messages:
-            message_list.append({
-                "id": msg.id,
-                "role": msg.role,
-                "content": msg.content,
-                "timestamp": msg.timestamp.isoformat(),
-                "metadata": msg.message_metadata
-            })
-        
-        return {
-            "messages": message_list
-        }
\ No newline at end of file
+    if (before is None) != (before_id is None):
+        raise HTTPException(status_code=400, detail="before and before_id must be given together")
+    cursor = (before, before_id) if before is not None else None
+
+    message_service = MessageService()
+    try:
+        messages = await message_service.get_latest_messages(session, conversation_id, limit, before=cursor)
+    except Exception as e:
+        logger.error("Error retrieving messages for conversation %s: %s", conversation_id, e)
+        raise HTTPException(status_code=500, detail="Error retrieving conversation messages")
+    
+    message_list = []
+    for msg in messages:
+        message_list.append({
+            "id": msg.id,
+            "role": msg.role,
+            "content": msg.content,
+            "timestamp": msg.timestamp,
+            "metadata": msg.message_metadata
+        })
+    
+    return {
+        "messages": message_list
+    }
\ No newline at end of file
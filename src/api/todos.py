@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+import hashlib
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..core.cache import commit
 from ..core.db import get_session
 from ..models.todo import Todo
 from ..services.todo_service import TodoService
@@ -9,53 +12,66 @@ from typing import Annotated, List
 router = APIRouter(prefix="/todos", tags=["todos"])
 todo_service = TodoService()
 
+# Set by the server, never taken from a request body; the timestamps are NOT
+# NULL columns, so an explicit null from a client would otherwise hit the DB
+_SERVER_FIELDS = {"id", "owner_id", "created_at", "updated_at"}
+
 @router.post("/", response_model=Todo)
-def create_todo(
+async def create_todo(
     todo: Todo,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[dict, Depends(get_current_user_token)]
 ):
-    todo.owner_id = user["sub"]
-    return todo_service.create_todo(session, todo)
+    todo = Todo(**todo.model_dump(exclude=_SERVER_FIELDS), owner_id=user["sub"])
+    todo = await todo_service.create_todo(session, todo)
+    await commit(session)
+    return todo
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
 
 @router.get("/", response_model=List[Todo])
-def read_todos(
-    session: Annotated[Session, Depends(get_session)],
+async def read_todos(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[dict, Depends(get_current_user_token)]
 ):
-    return todo_service.get_todos(session, user["sub"])
+    # The ETag hashes the exact body being served, so any edit changes it, even
+    # one with an unchanged updated_at. Polling clients that send it back get
+    # an empty 304 instead of the list.
+    todos = await todo_service.get_todos(session, user["sub"])
+    body = orjson.dumps([todo.model_dump(mode="json") for todo in todos])
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 @router.put("/{todo_id}", response_model=Todo)
-def update_todo(
+async def update_todo(
     todo_id: int,
     todo_update: Todo,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[dict, Depends(get_current_user_token)]
 ):
-    db_todo = todo_service.get_todo(session, todo_id)
-    if not db_todo:
+    # Ownership is part of the UPDATE's WHERE clause, so a missing todo and
+    # someone else's todo both come back as 404
+    patch = todo_update.model_dump(exclude_unset=True, exclude=_SERVER_FIELDS)
+    db_todo = await todo_service.partial_update(session, todo_id, user["sub"], patch)
+    if db_todo is None:
         raise HTTPException(status_code=404, detail="Todo not found")
-    if db_todo.owner_id != user["sub"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    todo_data = todo_update.model_dump(exclude_unset=True)
-    for key, value in todo_data.items():
-        if key != "id" and key != "owner_id":
-            setattr(db_todo, key, value)
-            
-    return todo_service.update_todo(session, db_todo)
+    await commit(session)
+    return db_todo
 
 @router.delete("/{todo_id}")
-def delete_todo(
+async def delete_todo(
     todo_id: int,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[dict, Depends(get_current_user_token)]
 ):
-    db_todo = todo_service.get_todo(session, todo_id)
-    if not db_todo:
+    # As with update, ownership is enforced by the DELETE itself
+    if not await todo_service.delete_owned(session, todo_id, user["sub"]):
         raise HTTPException(status_code=404, detail="Todo not found")
-    if db_todo.owner_id != user["sub"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    todo_service.delete_todo(session, db_todo)
+    await commit(session)
     return {"ok": True}
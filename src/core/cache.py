@@ -0,0 +1,113 @@
+import logging
+from typing import Any
+
+import orjson
+import redis.asyncio as redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cached results are also dropped once a write commits; the TTL only bounds
+# staleness when a read that began before the commit repopulates the key
+# after the invalidation
+CACHE_TTL_SECONDS = 60
+
+# Each key is a hash holding one field per query variant (e.g. status filter or
+# page size), so a write invalidates every variant with a single DEL
+redis_client = redis.Redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+
+async def cache_get(key: str, field: str) -> Any | None:
+    """Return the cached value for key/field, or None on a miss or when Redis is unavailable."""
+    if redis_client is None:
+        return None
+    try:
+        raw = await redis_client.hget(key, field)
+    except redis.RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+    return None if raw is None else orjson.loads(raw)
+
+
+async def cache_set(key: str, field: str, value: Any) -> None:
+    """Store a JSON-serializable value under key/field for CACHE_TTL_SECONDS."""
+    if redis_client is None:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, field, orjson.dumps(value))
+            pipe.expire(key, CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+async def cache_invalidate(key: str) -> None:
+    """Drop every cached variant under key."""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(key)
+    except redis.RedisError as e:
+        logger.warning("Cache invalidation failed for %s: %s", key, e)
+
+
+async def flag_set(key: str, ttl: int | None) -> bool:
+    """Set a standalone flag key, expiring after ttl seconds (never if None).
+
+    Returns False when Redis is unavailable, so callers can tell the flag
+    was not recorded.
+    """
+    if redis_client is None:
+        return False
+    try:
+        await redis_client.set(key, b"1", ex=ttl)
+    except redis.RedisError as e:
+        logger.warning("Flag write failed for %s: %s", key, e)
+        return False
+    return True
+
+
+async def flag_exists(key: str) -> bool:
+    """Whether a flag key is set; False on a miss or when Redis is unavailable."""
+    if redis_client is None:
+        return False
+    try:
+        return bool(await redis_client.exists(key))
+    except redis.RedisError as e:
+        logger.warning("Flag read failed for %s: %s", key, e)
+        return False
+
+
+# session.info entry holding the keys a transaction's writes have made stale
+_PENDING_INVALIDATIONS = "cache_invalidations"
+
+
+def invalidate_on_commit(session: AsyncSession, key: str) -> None:
+    """Queue key to be dropped once the session's transaction commits.
+
+    Dropping it at flush time would let a concurrent read cache the
+    pre-commit rows again before the write becomes visible.
+    """
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    # Rolled-back writes never became visible, so their keys are still valid
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commit the session, then drop every cache key its writes queued."""
+    try:
+        await session.commit()
+    finally:
+        # A failed commit wrote nothing, so its keys are discarded too
+        keys = session.info.pop(_PENDING_INVALIDATIONS, ())
+    for key in keys:
+        await cache_invalidate(key)
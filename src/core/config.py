@@ -1,10 +1,15 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Log every SQL statement; for local debugging only
+    SQL_ECHO: bool = False
+    # Read-through cache for hot queries; caching is off when unset
+    REDIS_URL: Optional[str] = None
     
     class Config:
         env_file = ".env"
@@ -1,8 +1,40 @@
-from sqlmodel import create_engine, Session
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+from database_url import to_async_url
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
+# Same async-driver rewrite as the root app: postgres:// aliases and Neon's
+# libpq-only query params are handled in database_url
+ASYNC_DATABASE_URL = to_async_url(settings.DATABASE_URL)
 
-def get_session():
-    with Session(engine) as session:
+def _pool_options(url: str) -> dict:
+    # An in-memory SQLite database (tests) lives in a single connection, so share it
+    if url.startswith("sqlite") and (url.endswith(":memory:") or url.rstrip("/").endswith(":")):
+        return {"poolclass": StaticPool}
+    # Keep enough warm connections for bursts of concurrent requests, so they
+    # don't each pay for TCP+TLS setup and authentication
+    return {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+def _connect_args(url: str) -> dict:
+    # asyncpg keeps prepared statements per connection; a larger cache lets
+    # repeated inserts and queries reuse them instead of re-preparing
+    if url.startswith("postgresql"):
+        return {"statement_cache_size": 1024}
+    return {}
+
+engine = create_async_engine(
+    ASYNC_DATABASE_URL, echo=settings.SQL_ECHO,
+    connect_args=_connect_args(ASYNC_DATABASE_URL), **_pool_options(ASYNC_DATABASE_URL)
+)
+async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+async def get_session():
+    async with async_session_maker() as session:
         yield session
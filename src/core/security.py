@@ -1,8 +1,21 @@
+import hashlib
 import jwt
+import math
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple
+from .cache import flag_exists, flag_set
 from .config import settings
 
+# Verified tokens are cached (LRU + TTL) so a user's rapid requests skip the
+# signature check and payload decode
+TOKEN_CACHE_MAXSIZE = 10_000
+TOKEN_CACHE_TTL = 60.0  # seconds, never past the token's own exp
+
+# Maps blake2b(token) -> (expires_at, payload)
+_token_cache: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -13,9 +26,52 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 def verify_token(token: str):
+    key = _token_cache_key(token)
+    now = time.time()
+
+    cached = _token_cache.get(key)
+    if cached is not None:
+        expires_at, payload = cached
+        if expires_at > now:
+            _token_cache.move_to_end(key)
+            return dict(payload)
+        del _token_cache[key]
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except jwt.InvalidTokenError:
         return None
+
+    exp = payload.get("exp")
+    ttl = TOKEN_CACHE_TTL if exp is None else min(TOKEN_CACHE_TTL, exp - now)
+    if ttl > 0:
+        _token_cache[key] = (now + ttl, payload)
+        if len(_token_cache) > TOKEN_CACHE_MAXSIZE:
+            _token_cache.popitem(last=False)
+    return dict(payload)
+
+def invalidate_token(token: str) -> None:
+    """Drop a token from this process's verification cache."""
+    _token_cache.pop(_token_cache_key(token), None)
+
+def _revocation_key(token: str) -> str:
+    return "revoked:" + _token_cache_key(token).hex()
+
+async def revoke_token(token: str, payload: Dict) -> bool:
+    """Revoke a token on logout, for every process sharing Redis.
+
+    The revocation is kept only until the token's own exp, after which
+    jwt.decode rejects it anyway. Returns False when Redis is unavailable
+    and the token could not be revoked.
+    """
+    invalidate_token(token)
+    exp = payload.get("exp")
+    ttl = None if exp is None else max(1, math.ceil(exp - time.time()))
+    return await flag_set(_revocation_key(token), ttl)
+
+async def is_token_revoked(token: str) -> bool:
+    return await flag_exists(_revocation_key(token))
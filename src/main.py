@@ -1,9 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
+from .core.db import engine
 from .api import auth, todos
 
-app = FastAPI(title="Todo API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled connections on shutdown instead of leaving them open
+    await engine.dispose()
+
+app = FastAPI(title="Todo API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -1,12 +1,36 @@
-from sqlmodel import SQLModel, Field
-from datetime import datetime, timezone
-from typing import Optional
-import uuid
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Column, DateTime, func
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+from ..core.ids import uuid7
+
+if TYPE_CHECKING:
+    from .message import Message
 
 class Conversation(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    # Timestamps are filled in by the database and read back via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
+    id: str = Field(default_factory=uuid7, primary_key=True)
     user_id: str = Field(index=True)  # References user ID from existing user model
     title: Optional[str] = Field(default="New Conversation", max_length=255)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    is_active: bool = True
\ No newline at end of file
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    )
+    is_active: bool = True
+
+    # Oldest first; load with selectinload(Conversation.messages) when listing
+    # several conversations so their messages come back in one extra query.
+    # The target is module-qualified since the root app also has a Message model.
+    messages: List["Message"] = Relationship(
+        sa_relationship=relationship(
+            "src.models.message.Message",
+            back_populates="conversation",
+            order_by="[src.models.message.Message.timestamp, src.models.message.Message.id]",
+        )
+    )
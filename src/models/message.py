@@ -1,12 +1,33 @@
-from sqlmodel import SQLModel, Field
-from datetime import datetime, timezone
-from typing import Optional
-import uuid
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import JSON, Column, DateTime, Index, func, text
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from ..core.ids import uuid7
+
+if TYPE_CHECKING:
+    from .conversation import Conversation
 
 class Message(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    # The timestamp is filled in by the database and read back via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+    # Serves "a conversation's latest messages", including (timestamp, id) keyset pages
+    __table_args__ = (Index("ix_message_conv_ts", "conversation_id", text("timestamp DESC"), text("id DESC")),)
+
+    id: str = Field(default_factory=uuid7, primary_key=True)
     conversation_id: str = Field(index=True, foreign_key="conversation.id")
     role: str = Field(sa_column_kwargs={"comment": "user, assistant, or system"})
     content: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    message_metadata: Optional[dict] = Field(default=None, sa_column_kwargs={"comment": "JSON metadata"})
\ No newline at end of file
+    timestamp: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    )
+    # Stored in the "metadata_" column created by migration 001
+    message_metadata: Optional[dict] = Field(
+        default=None, sa_column=Column("metadata_", JSON, nullable=True, comment="JSON metadata")
+    )
+
+    # Targets are module-qualified: the root app's models also define
+    # Conversation and Message classes in the same SQLModel registry
+    conversation: Optional["Conversation"] = Relationship(
+        sa_relationship=relationship("src.models.conversation.Conversation", back_populates="messages")
+    )
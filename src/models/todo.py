@@ -1,12 +1,24 @@
 from sqlmodel import SQLModel, Field
-from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Index, func
+from datetime import datetime
 from typing import Optional
 
 class Todo(SQLModel, table=True):
+    # Fetch server-generated columns in the INSERT/UPDATE itself (RETURNING)
+    # instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    # Serves "an owner's todos, optionally by completion status"
+    __table_args__ = (Index("ix_todo_owner_completed", "owner_id", "is_completed"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     description: Optional[str] = None
     is_completed: bool = False
     owner_id: str = Field(index=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    )
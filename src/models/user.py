@@ -1,10 +1,19 @@
 from sqlmodel import SQLModel, Field
-from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, func
+from datetime import datetime
 from typing import Optional
 
 class User(SQLModel, table=True):
+    # Timestamps are filled in by the database and read back via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
     id: str = Field(primary_key=True)
     email: str = Field(index=True, unique=True)
     name: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    )
@@ -1,35 +1,63 @@
 from datetime import datetime
-from sqlmodel import Session, select
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from ..models.conversation import Conversation
 
 
 class ConversationService:
-    def create_conversation(self, session: Session, user_id: str, title: Optional[str] = None) -> Conversation:
+    # Writes are flushed, not committed; the caller commits once per request.
+    # Ids are generated client-side and the server-default timestamps come
+    # back through RETURNING (eager_defaults), so nothing needs a refresh.
+    async def create_conversation(self, session: AsyncSession, user_id: str, title: Optional[str] = None) -> Conversation:
         conversation = Conversation(user_id=user_id, title=title or f"Conversation {datetime.now().strftime('%Y-%m-%d %H:%M')}")
         session.add(conversation)
-        session.commit()
-        session.refresh(conversation)
+        await session.flush()
         return conversation
 
-    def get_user_conversations(self, session: Session, user_id: str, active_only: bool = False) -> List[Conversation]:
+    async def get_user_conversations(
+        self, session: AsyncSession, user_id: str, active_only: bool = False,
+        limit: Optional[int] = None, offset: int = 0
+    ) -> List[Conversation]:
         query = select(Conversation).where(Conversation.user_id == user_id)
         if active_only:
             query = query.where(Conversation.is_active == True)
-        return session.exec(query).all()
+        query = query.order_by(Conversation.updated_at.desc()).offset(offset).limit(limit)
+        return (await session.exec(query)).all()
 
-    def get_conversation(self, session: Session, conversation_id: str) -> Conversation | None:
-        return session.get(Conversation, conversation_id)
+    async def get_user_conversations_with_messages(
+        self, session: AsyncSession, user_id: str, active_only: bool = False
+    ) -> List[Conversation]:
+        # selectinload fetches every conversation's messages in a single
+        # IN (...) query instead of one query per conversation, and without
+        # the row duplication a JOIN on a one-to-many would cause
+        query = (
+            select(Conversation)
+            .where(Conversation.user_id == user_id)
+            .options(selectinload(Conversation.messages))
+        )
+        if active_only:
+            query = query.where(Conversation.is_active == True)
+        query = query.order_by(Conversation.updated_at.desc())
+        return (await session.exec(query)).all()
+
+    async def count_user_conversations(self, session: AsyncSession, user_id: str, active_only: bool = False) -> int:
+        query = select(func.count()).select_from(Conversation).where(Conversation.user_id == user_id)
+        if active_only:
+            query = query.where(Conversation.is_active == True)
+        return (await session.exec(query)).one()
+
+    async def get_conversation(self, session: AsyncSession, conversation_id: str) -> Conversation | None:
+        return await session.get(Conversation, conversation_id)
 
-    def update_conversation(self, session: Session, conversation: Conversation) -> Conversation:
+    async def update_conversation(self, session: AsyncSession, conversation: Conversation) -> Conversation:
         session.add(conversation)
-        session.commit()
-        session.refresh(conversation)
+        await session.flush()
         return conversation
 
-    def deactivate_conversation(self, session: Session, conversation: Conversation) -> Conversation:
+    async def deactivate_conversation(self, session: AsyncSession, conversation: Conversation) -> Conversation:
         conversation.is_active = False
         session.add(conversation)
-        session.commit()
-        session.refresh(conversation)
+        await session.flush()
         return conversation
\ No newline at end of file
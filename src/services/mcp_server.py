@@ -5,18 +5,22 @@ Implements the MCP protocol to connect AI agents with backend services
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
 
 
 class MCPCall(BaseModel):
     """Represents an incoming MCP call"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     method: str
     params: Dict[str, Any]
 
 
 class MCPResponse(BaseModel):
     """Represents an MCP response"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     result: Optional[Any] = None
     error: Optional[Dict[str, str]] = None
 
@@ -34,23 +38,25 @@ class MCPServer:
     """MCP Server that manages tools and handles requests"""
     
     def __init__(self):
-        self.tools: Dict[str, MCPTool] = {}
+        # Maps method name -> the tool's bound execute coroutine function,
+        # resolved once at registration
+        self.tools: Dict[str, Callable[[Dict[str, Any]], Awaitable[MCPResponse]]] = {}
         
     def register_tool(self, name: str, tool: MCPTool):
         """Register an MCP tool"""
-        self.tools[name] = tool
+        self.tools[name] = tool.execute
         
     async def handle_request(self, call: MCPCall) -> MCPResponse:
         """Handle an incoming MCP request"""
-        if call.method not in self.tools:
+        execute = self.tools.get(call.method)
+        if execute is None:
             return MCPResponse(error={
                 "code": "METHOD_NOT_FOUND",
                 "message": f"Method {call.method} not found"
             })
             
         try:
-            tool = self.tools[call.method]
-            return await tool.execute(call.params)
+            return await execute(call.params)
         except Exception as e:
             return MCPResponse(error={
                 "code": "EXECUTION_ERROR",
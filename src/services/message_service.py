@@ -1,11 +1,19 @@
-from sqlmodel import Session, select
-from typing import List
+from sqlalchemy import lambda_stmt, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional, Tuple
 from datetime import datetime
+from ..core.cache import cache_get, cache_set, invalidate_on_commit
 from ..models.message import Message
 
 
+def _messages_cache_key(conversation_id: str) -> str:
+    return f"msgs:{conversation_id}"
+
+
 class MessageService:
-    def create_message(self, session: Session, conversation_id: str, role: str, content: str, metadata: dict = None) -> Message:
+    async def create_message(self, session: AsyncSession, conversation_id: str, role: str, content: str, metadata: dict = None) -> Message:
+        """Add a message to the session; the caller commits with core.cache.commit."""
         message = Message(
             conversation_id=conversation_id,
             role=role,
@@ -13,22 +21,42 @@ class MessageService:
             message_metadata=metadata
         )
         session.add(message)
-        session.commit()
-        session.refresh(message)
+        invalidate_on_commit(session, _messages_cache_key(conversation_id))
         return message
 
-    def get_messages_by_conversation(self, session: Session, conversation_id: str) -> List[Message]:
-        query = select(Message).where(Message.conversation_id == conversation_id).order_by(Message.timestamp.asc())
-        return session.exec(query).all()
-
-    def get_latest_messages(self, session: Session, conversation_id: str, limit: int = 10) -> List[Message]:
-        query = (
-            select(Message)
+    async def get_messages_by_conversation(self, session: AsyncSession, conversation_id: str) -> List[Message]:
+        query = lambda_stmt(
+            lambda: select(Message)
             .where(Message.conversation_id == conversation_id)
-            .order_by(Message.timestamp.desc())
-            .limit(limit)
+            .order_by(Message.timestamp.asc(), Message.id.asc())
         )
-        return session.exec(query).all()
+        return (await session.exec(query)).scalars().all()
+
+    async def get_latest_messages(
+        self, session: AsyncSession, conversation_id: str, limit: int = 10,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Message]:
+        """Newest messages first; pass the oldest (timestamp, id) seen as `before` to fetch the next page.
+
+        Pages are keyset-based, so each one is a range read on ix_message_conv_ts
+        rather than an OFFSET scan. The id breaks ties between messages stored
+        with the same timestamp, which would otherwise be skipped or repeated.
+        """
+        # Only the first page is cached; it is the one read on every chat turn
+        key, field = _messages_cache_key(conversation_id), str(limit)
+        if before is None:
+            cached = await cache_get(key, field)
+            if cached is not None:
+                return [Message.model_validate(row) for row in cached]
+
+        query = select(Message).where(Message.conversation_id == conversation_id)
+        if before is not None:
+            query = query.where(tuple_(Message.timestamp, Message.id) < tuple_(*before))
+        query = query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit)
+        messages = (await session.exec(query)).all()
+        if before is None:
+            await cache_set(key, field, [message.model_dump() for message in messages])
+        return messages
 
-    def get_message(self, session: Session, message_id: str) -> Message | None:
-        return session.get(Message, message_id)
\ No newline at end of file
+    async def get_message(self, session: AsyncSession, message_id: str) -> Message | None:
+        return await session.get(Message, message_id)
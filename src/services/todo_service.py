@@ -1,26 +1,83 @@
-from sqlmodel import Session, select
+from sqlalchemy import RowMapping, delete, lambda_stmt, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..core.cache import cache_get, cache_set, invalidate_on_commit
 from ..models.todo import Todo
 
+
+def _todos_cache_key(owner_id: str) -> str:
+    return f"todos:{owner_id}"
+
+
 class TodoService:
-    def create_todo(self, session: Session, todo: Todo) -> Todo:
+    # Writes are flushed, not committed: the INSERT/UPDATE hands generated
+    # columns back via RETURNING, and the caller commits once per request with
+    # core.cache.commit, which drops the owner's cached lists afterwards
+    async def create_todo(self, session: AsyncSession, todo: Todo) -> Todo:
         session.add(todo)
-        session.commit()
-        session.refresh(todo)
+        await session.flush()
+        invalidate_on_commit(session, _todos_cache_key(todo.owner_id))
         return todo
 
-    def get_todos(self, session: Session, owner_id: str) -> list[Todo]:
-        statement = select(Todo).where(Todo.owner_id == owner_id)
-        return session.exec(statement).all()
+    async def get_todos(self, session: AsyncSession, owner_id: str, is_completed: bool | None = None) -> list[Todo]:
+        key, field = _todos_cache_key(owner_id), str(is_completed)
+        cached = await cache_get(key, field)
+        if cached is not None:
+            return [Todo.model_validate(row) for row in cached]
+
+        # lambda_stmt caches the compiled SQL per lambda; owner_id and
+        # is_completed are extracted as bound parameters on each call
+        statement = lambda_stmt(lambda: select(Todo).where(Todo.owner_id == owner_id))
+        if is_completed is not None:
+            statement += lambda s: s.where(Todo.is_completed == is_completed)
+        todos = (await session.exec(statement)).scalars().all()
+        await cache_set(key, field, [todo.model_dump() for todo in todos])
+        return todos
+
+    async def list_task_dicts(self, session: AsyncSession, owner_id: str, is_completed: bool | None = None) -> list[RowMapping]:
+        # Selects only the columns callers render and returns plain row
+        # mappings, so no Todo instances are built or tracked by the session
+        statement = select(
+            Todo.id, Todo.title, Todo.description, Todo.is_completed, Todo.created_at, Todo.updated_at
+        ).where(Todo.owner_id == owner_id)
+        if is_completed is not None:
+            statement = statement.where(Todo.is_completed == is_completed)
+        return (await session.exec(statement)).mappings().all()
 
-    def get_todo(self, session: Session, todo_id: int) -> Todo | None:
-        return session.get(Todo, todo_id)
+    async def get_todo(self, session: AsyncSession, todo_id: int) -> Todo | None:
+        return await session.get(Todo, todo_id)
 
-    def update_todo(self, session: Session, todo: Todo) -> Todo:
+    async def update_todo(self, session: AsyncSession, todo: Todo) -> Todo:
         session.add(todo)
-        session.commit()
-        session.refresh(todo)
+        await session.flush()
+        invalidate_on_commit(session, _todos_cache_key(todo.owner_id))
         return todo
 
-    def delete_todo(self, session: Session, todo: Todo):
-        session.delete(todo)
-        session.commit()
+    async def partial_update(self, session: AsyncSession, todo_id: int, owner_id: str, patch: dict) -> Todo | None:
+        """Apply `patch` to the owner's todo in one UPDATE ... RETURNING.
+
+        Returns None when the todo doesn't exist or belongs to someone else.
+        """
+        statement = (
+            update(Todo)
+            .where(Todo.id == todo_id, Todo.owner_id == owner_id)
+            .values(**patch)
+            .returning(Todo)
+        )
+        todo = (await session.exec(statement)).scalar_one_or_none()
+        if todo is not None:
+            invalidate_on_commit(session, _todos_cache_key(owner_id))
+        return todo
+
+    async def delete_todo(self, session: AsyncSession, todo: Todo):
+        await session.delete(todo)
+        await session.flush()
+        invalidate_on_commit(session, _todos_cache_key(todo.owner_id))
+
+    async def delete_owned(self, session: AsyncSession, todo_id: int, owner_id: str) -> bool:
+        """Delete the owner's todo in one DELETE ... RETURNING; False if nothing matched."""
+        statement = delete(Todo).where(Todo.id == todo_id, Todo.owner_id == owner_id).returning(Todo.id)
+        deleted = (await session.exec(statement)).scalar_one_or_none() is not None
+        if deleted:
+            invalidate_on_commit(session, _todos_cache_key(owner_id))
+        return deleted
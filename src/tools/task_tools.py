@@ -4,12 +4,16 @@ Implements the tools that the AI agent will use to manipulate tasks
 """
 
 from typing import Dict, Any, List
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
 from ..models.todo import Todo
 from ..services.todo_service import TodoService
 
 
+# get_tasks status values that map to an is_completed filter
+STATUS_FILTERS = {"completed": True, "pending": False}
+
+
 class TaskMCPTask(BaseModel):
     title: str
     description: str = None
@@ -27,11 +31,17 @@ class TaskMCPUpdate(BaseModel):
 class TaskTools:
     """Collection of MCP tools for task operations"""
     
-    def __init__(self, db_session: Session):
+    # Methods the AI agent may call, by tool name
+    TOOL_NAMES = ("create_task", "get_tasks", "update_task", "delete_task", "complete_task")
+
+    def __init__(self, db_session: AsyncSession):
         self.session = db_session
         self.service = TodoService()
+        # Bound once so a tool call is a single dict lookup, and only the
+        # listed methods can be reached by name
+        self.dispatch = {name: getattr(self, name) for name in self.TOOL_NAMES}
     
-    def create_task(self, title: str, description: str = None, owner_id: str = None) -> Dict[str, Any]:
+    async def create_task(self, title: str, description: str = None, owner_id: str = None) -> Dict[str, Any]:
         """Create a new task"""
         try:
             # Create a new Todo instance
@@ -43,7 +53,7 @@ class TaskTools:
             )
             
             # Use the existing service to create the task
-            created_todo = self.service.create_todo(self.session, new_todo)
+            created_todo = await self.service.create_todo(self.session, new_todo)
             
             return {
                 "success": True,
@@ -56,30 +66,16 @@ class TaskTools:
                 "error": str(e)
             }
     
-    def get_tasks(self, owner_id: str, status: str = None) -> Dict[str, Any]:
+    async def get_tasks(self, owner_id: str, status: str = None) -> Dict[str, Any]:
         """Retrieve tasks for a specific user"""
         try:
-            # Get tasks using the existing service
-            todos = self.service.get_todos(self.session, owner_id)
-            
-            # Filter by status if provided
-            if status:
-                if status.lower() == "completed":
-                    todos = [t for t in todos if t.is_completed]
-                elif status.lower() == "pending":
-                    todos = [t for t in todos if not t.is_completed]
+            # Filter by status in the query; "all" (or anything else) means no filter
+            is_completed = STATUS_FILTERS.get(status.lower()) if status else None
+            rows = await self.service.list_task_dicts(self.session, owner_id, is_completed=is_completed)
             
-            # Format the response
-            tasks = []
-            for todo in todos:
-                tasks.append({
-                    "id": todo.id,
-                    "title": todo.title,
-                    "description": todo.description,
-                    "is_completed": todo.is_completed,
-                    "created_at": todo.created_at.isoformat(),
-                    "updated_at": todo.updated_at.isoformat()
-                })
+            # Datetimes are left as-is; orjson renders them as ISO 8601 when the
+            # tool output is serialized
+            tasks = [dict(row) for row in rows]
             
             return {
                 "success": True,
@@ -92,11 +88,11 @@ class TaskTools:
                 "error": str(e)
             }
     
-    def update_task(self, id: int, title: str = None, description: str = None, is_completed: bool = None, owner_id: str = None) -> Dict[str, Any]:
+    async def update_task(self, id: int, title: str = None, description: str = None, is_completed: bool = None, owner_id: str = None) -> Dict[str, Any]:
         """Update an existing task"""
         try:
             # Get the existing task
-            existing_todo = self.service.get_todo(self.session, id)
+            existing_todo = await self.service.get_todo(self.session, id)
             if not existing_todo:
                 return {
                     "success": False,
@@ -114,7 +110,7 @@ class TaskTools:
                 existing_todo.owner_id = owner_id
             
             # Use the existing service to update the task
-            updated_todo = self.service.update_todo(self.session, existing_todo)
+            updated_todo = await self.service.update_todo(self.session, existing_todo)
             
             return {
                 "success": True,
@@ -127,11 +123,11 @@ class TaskTools:
                 "error": str(e)
             }
     
-    def delete_task_with_confirmation(self, id: int, confirmed: bool = False) -> Dict[str, Any]:
+    async def delete_task_with_confirmation(self, id: int, confirmed: bool = False) -> Dict[str, Any]:
         """Delete a task with confirmation"""
         try:
             # Get the task to be deleted
-            todo_to_delete = self.service.get_todo(self.session, id)
+            todo_to_delete = await self.service.get_todo(self.session, id)
             if not todo_to_delete:
                 return {
                     "success": False,
@@ -148,7 +144,7 @@ class TaskTools:
                 }
             
             # Use the existing service to delete the task
-            self.service.delete_todo(self.session, todo_to_delete)
+            await self.service.delete_todo(self.session, todo_to_delete)
             
             return {
                 "success": True,
@@ -160,15 +156,15 @@ class TaskTools:
                 "error": str(e)
             }
     
-    def delete_task(self, id: int) -> Dict[str, Any]:
+    async def delete_task(self, id: int) -> Dict[str, Any]:
         """Delete a task (wrapper for backward compatibility)"""
-        return self.delete_task_with_confirmation(id, confirmed=True)
+        return await self.delete_task_with_confirmation(id, confirmed=True)
     
-    def complete_task(self, id: int) -> Dict[str, Any]:
+    async def complete_task(self, id: int) -> Dict[str, Any]:
         """Mark a task as completed"""
         try:
             # Get the existing task
-            existing_todo = self.service.get_todo(self.session, id)
+            existing_todo = await self.service.get_todo(self.session, id)
             if not existing_todo:
                 return {
                     "success": False,
@@ -177,7 +173,7 @@ class TaskTools:
             
             # Update the task to mark as completed
             existing_todo.is_completed = True
-            updated_todo = self.service.update_todo(self.session, existing_todo)
+            updated_todo = await self.service.update_todo(self.session, existing_todo)
             
             return {
                 "success": True,
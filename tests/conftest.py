@@ -0,0 +1,84 @@
+"""Shared test setup: both apps run against a throwaway SQLite database."""
+
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+import pytest
+
+# Must be set before db / src.core.db are imported, since both build their
+# engines at import time
+_DB_DIR = tempfile.mkdtemp(prefix="todo-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key-long-enough-for-hs256-signing")
+os.environ.pop("REDIS_URL", None)
+
+
+@pytest.fixture(scope="session")
+def tables():
+    """Create every table once per test run."""
+    from sqlmodel import SQLModel
+
+    import db
+    import models  # noqa: F401
+    from src.models import conversation, message, todo, user  # noqa: F401
+
+    async def create():
+        async with db.async_engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        await db.async_engine.dispose()
+
+    asyncio.run(create())
+
+
+@pytest.fixture
+def client(tables):
+    """TestClient for the root app."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def src_client(tables):
+    """TestClient for the src app."""
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def auth_headers():
+    """Factory for Authorization headers carrying a fresh src-app JWT."""
+    import jwt
+
+    def make(owner_id=None):
+        claims = {"sub": owner_id or f"user-{uuid.uuid4().hex}", "exp": int(time.time()) + 600}
+        return {"Authorization": f"Bearer {jwt.encode(claims, os.environ['SECRET_KEY'], algorithm='HS256')}"}
+
+    return make
+
+
+@pytest.fixture
+def run_src():
+    """Run a coroutine against the src engine, disposing its pool afterwards."""
+    from src.core.db import engine
+
+    def run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
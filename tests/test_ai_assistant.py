@@ -0,0 +1,83 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlmodel import select
+
+from db import async_engine, async_session_maker
+from models import Task
+from routes import ai_assistant
+from routes.ai_assistant import get_ai_response
+
+
+@pytest.fixture
+def chat(tables):
+    """Send messages for a fresh user who starts with tasks t1..t3 (oldest first)."""
+    user_id = f"user-{uuid.uuid4().hex}"
+    ai_assistant._task_count_cache.clear()
+
+    async def seed():
+        async with async_session_maker() as session:
+            for i in (1, 2, 3):
+                session.add(Task(user_id=user_id, title=f"t{i}", description=""))
+                await session.commit()
+
+    async def send(message):
+        async with async_session_maker() as session:
+            result = await get_ai_response(message, user_id, session)
+            titles = (await session.exec(
+                select(Task.title).where(Task.user_id == user_id).order_by(Task.created_at.asc(), Task.id.asc())
+            )).all()
+        await async_engine.dispose()
+        return result, titles
+
+    asyncio.run(seed())
+    return lambda message: asyncio.run(send(message))
+
+
+def test_create_uses_first_pattern_with_a_title(chat):
+    result, titles = chat("add a task to buy milk please")
+    assert result["task_created"] is True
+    assert titles[-1] == "Buy Milk"
+
+
+def test_create_falls_back_to_later_pattern_when_title_is_empty(chat):
+    # "add.*task.*to (.+)" captures only "for me", which the suffix cleanup
+    # empties; the next pattern, "add.*task (.+)", must still be tried
+    result, titles = chat("add buy task thanks to for me")
+    assert result["task_created"] is True
+    assert titles[-1] == "Thanks To"
+
+
+def test_create_is_case_insensitive(chat):
+    result, titles = chat("ADD TASK Walk The Dog")
+    assert result["task_created"] is True
+    assert titles[-1] == "Walk The Dog"
+
+
+def test_delete_patterns_are_tried_in_order(chat):
+    # "delete.*#?(\d+)" is tried before ".*task.*del.*id.*?(\d+)" even though
+    # the latter matches further left, so the task number is 2, not 12
+    result, titles = chat("task delete id 12")
+    assert result["response"] == "✓ Deleted task #2 't2'"
+    assert titles == ["t1", "t3"]
+
+
+def test_delete_out_of_range_reports_task_count(chat):
+    result, titles = chat("remove task 7")
+    assert result["response"] == "Task #7 not found. You have 3 task(s)."
+    assert titles == ["t1", "t2", "t3"]
+
+
+def test_list_takes_priority_over_complete(chat):
+    result, _ = chat("show me task 2 completed")
+    assert result["response"].startswith("Here are your tasks:")
+
+
+def test_complete_and_greeting_and_fallback(chat):
+    result, _ = chat("mark task #1 as completed")
+    assert result["response"] == "✓ Marked task #1 't1' as completed!"
+    result, _ = chat("Hey there")
+    assert result["response"].startswith("Hello!")
+    result, _ = chat("what is up")
+    assert result["response"].startswith("I understand: 'what is up'.")
@@ -0,0 +1,89 @@
+import asyncio
+import uuid
+
+import bcrypt
+from argon2 import PasswordHasher
+from sqlmodel import select
+
+from db import async_engine, async_session_maker
+from models import User
+from routes.auth import MAX_PASSWORD_LENGTH, _password_hasher, verify_password
+
+PASSWORD = "correct horse battery"
+
+
+def _new_email():
+    return f"user-{uuid.uuid4().hex}@example.com"
+
+
+def _add_user(email, password_hash):
+    async def add():
+        async with async_session_maker() as session:
+            session.add(User(email=email, password_hash=password_hash))
+            await session.commit()
+        await async_engine.dispose()
+
+    asyncio.run(add())
+
+
+def _stored_hash(email):
+    async def get():
+        async with async_session_maker() as session:
+            stored = (await session.exec(select(User.password_hash).where(User.email == email))).one()
+        await async_engine.dispose()
+        return stored
+
+    return asyncio.run(get())
+
+
+def _login(client, email, password=PASSWORD):
+    return client.post("/api/auth/login", json={"email": email, "password": password})
+
+
+def test_legacy_bcrypt_hash_logs_in_and_is_upgraded_to_argon2id(client):
+    email = _new_email()
+    _add_user(email, bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode())
+
+    assert _login(client, email, "wrong password").status_code == 401
+    assert _stored_hash(email).startswith("$2")
+
+    assert _login(client, email).status_code == 200
+    upgraded = _stored_hash(email)
+    assert upgraded.startswith("$argon2id$")
+    assert not _password_hasher.check_needs_rehash(upgraded)
+    assert verify_password(PASSWORD, upgraded)
+
+    # The upgraded hash keeps working
+    assert _login(client, email).status_code == 200
+
+
+def test_argon2_hash_with_outdated_parameters_is_rehashed(client):
+    email = _new_email()
+    outdated = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash(PASSWORD)
+    assert _password_hasher.check_needs_rehash(outdated)
+    _add_user(email, outdated)
+
+    assert _login(client, email).status_code == 200
+    rehashed = _stored_hash(email)
+    assert rehashed != outdated
+    assert not _password_hasher.check_needs_rehash(rehashed)
+    assert verify_password(PASSWORD, rehashed)
+
+
+def test_current_argon2_hash_is_left_alone(client):
+    email = _new_email()
+    current = _password_hasher.hash(PASSWORD)
+    _add_user(email, current)
+
+    assert _login(client, email).status_code == 200
+    assert _stored_hash(email) == current
+
+
+def test_password_length_limit_on_signup(client):
+    too_long = client.post("/api/auth/signup", json={"email": _new_email(), "password": "x" * 129})
+    assert too_long.status_code == 422
+
+    at_limit = client.post(
+        "/api/auth/signup", json={"email": _new_email(), "password": "x" * MAX_PASSWORD_LENGTH}
+    )
+    assert at_limit.status_code == 201
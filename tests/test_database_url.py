@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from database_url import to_async_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("postgresql://u:p@host/db", "postgresql+asyncpg://u:p@host/db"),
+        ("postgres://u:p@host/db", "postgresql+asyncpg://u:p@host/db"),
+        (
+            "postgresql://u:p@host/db?sslmode=require&channel_binding=require",
+            "postgresql+asyncpg://u:p@host/db?ssl=require",
+        ),
+        (
+            "postgres://u:p@host/db?channel_binding=require&sslmode=verify-full&application_name=todo",
+            "postgresql+asyncpg://u:p@host/db?application_name=todo&ssl=verify-full",
+        ),
+        ("sqlite:///./todo_app.db", "sqlite+aiosqlite:///./todo_app.db"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ],
+)
+def test_to_async_url(url, expected):
+    assert to_async_url(url) == expected
+
+
+def test_src_db_imports_with_in_memory_sqlite():
+    # src.core.db must not build the root app's engine, whose pool options
+    # SQLite's in-memory StaticPool rejects
+    code = (
+        "import sys, src.core.db as d; "
+        "assert 'db' not in sys.modules; "
+        "assert type(d.engine.pool).__name__ == 'StaticPool'"
+    )
+    env = {**os.environ, "DATABASE_URL": "sqlite://"}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,51 @@
+import jwt_utils
+from jwt_utils import create_access_token, verify_token
+
+
+def test_verify_token_is_cached(monkeypatch):
+    jwt_utils._token_cache.clear()
+    token = create_access_token("user_a", "a@example.com")
+
+    calls = []
+    original = jwt_utils._verify_token_uncached
+
+    def counting(t):
+        calls.append(t)
+        return original(t)
+
+    monkeypatch.setattr(jwt_utils, "_verify_token_uncached", counting)
+
+    assert verify_token(token) == {"user_id": "user_a", "email": "a@example.com"}
+    assert verify_token(token) == {"user_id": "user_a", "email": "a@example.com"}
+    assert len(calls) == 1
+
+
+def test_invalid_token_is_negatively_cached(monkeypatch):
+    jwt_utils._token_cache.clear()
+    assert verify_token("not-a-token") is None
+
+    def fail(t):
+        raise AssertionError("invalid token should have been served from cache")
+
+    monkeypatch.setattr(jwt_utils, "_verify_token_uncached", fail)
+    assert verify_token("not-a-token") is None
+
+
+def test_expired_cache_entry_is_reverified(monkeypatch):
+    jwt_utils._token_cache.clear()
+    token = create_access_token("user_b", "b@example.com")
+    assert verify_token(token)["user_id"] == "user_b"
+
+    now = jwt_utils.time.time()
+    monkeypatch.setattr(jwt_utils.time, "time", lambda: now + jwt_utils.TOKEN_CACHE_TTL + 1)
+    calls = []
+    original = jwt_utils._verify_token_uncached
+
+    def counting(t):
+        calls.append(t)
+        return original(t)
+
+    monkeypatch.setattr(jwt_utils, "_verify_token_uncached", counting)
+
+    assert verify_token(token)["user_id"] == "user_b"
+    assert len(calls) == 1
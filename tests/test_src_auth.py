@@ -0,0 +1,49 @@
+import pytest
+
+from src.core import cache
+
+
+class _FlagStore:
+    """The two Redis commands token revocation uses, shared like a real server."""
+
+    def __init__(self):
+        self.ttls = {}
+
+    async def set(self, key, value, ex=None):
+        self.ttls[key] = ex
+
+    async def exists(self, key):
+        return int(key in self.ttls)
+
+
+@pytest.fixture
+def shared_redis(monkeypatch):
+    store = _FlagStore()
+    monkeypatch.setattr(cache, "redis_client", store)
+    return store
+
+
+def test_logout_revokes_the_token(src_client, shared_redis, auth_headers):
+    token = auth_headers()
+    assert src_client.get("/api/auth/whoami", headers=token).status_code == 200
+
+    assert src_client.post("/api/auth/logout", headers=token).status_code == 204
+    # The revocation expires with the token
+    assert all(0 < ttl <= 600 for ttl in shared_redis.ttls.values())
+
+    assert src_client.get("/api/auth/whoami", headers=token).status_code == 401
+    assert src_client.get("/api/todos/", headers=token).status_code == 401
+    # Other tokens are unaffected
+    assert src_client.get("/api/auth/whoami", headers=auth_headers()).status_code == 200
+
+
+def test_logout_without_redis_reports_that_nothing_was_revoked(src_client, auth_headers):
+    token = auth_headers()
+    response = src_client.post("/api/auth/logout", headers=token)
+    assert response.status_code == 503
+    assert src_client.get("/api/auth/whoami", headers=token).status_code == 200
+
+
+def test_logout_requires_a_valid_token(src_client):
+    response = src_client.post("/api/auth/logout", headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
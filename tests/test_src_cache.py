@@ -0,0 +1,46 @@
+import uuid
+
+import pytest
+
+from src.core import cache
+from src.core.db import async_session_maker
+from src.models.todo import Todo
+from src.services.todo_service import TodoService
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    keys = []
+
+    async def record(key):
+        keys.append(key)
+
+    monkeypatch.setattr(cache, "cache_invalidate", record)
+    return keys
+
+
+def test_cache_is_invalidated_after_commit_not_at_flush(tables, invalidated, run_src):
+    owner = f"user-{uuid.uuid4().hex}"
+
+    async def write():
+        async with async_session_maker() as session:
+            await TodoService().create_todo(session, Todo(title="t", owner_id=owner))
+            assert invalidated == []
+            await cache.commit(session)
+
+    run_src(write())
+    assert invalidated == [f"todos:{owner}"]
+
+
+def test_rolled_back_writes_invalidate_nothing(tables, invalidated, run_src):
+    owner = f"user-{uuid.uuid4().hex}"
+
+    async def write():
+        async with async_session_maker() as session:
+            await TodoService().create_todo(session, Todo(title="t", owner_id=owner))
+            await session.rollback()
+            # The next transaction only reads, so there is nothing to drop
+            await cache.commit(session)
+
+    run_src(write())
+    assert invalidated == []
@@ -0,0 +1,80 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core.db import async_session_maker
+from src.models.message import Message
+from src.services.conversation_service import ConversationService
+from src.services.message_service import MessageService
+
+
+@pytest.fixture
+def conversation_id(tables, run_src):
+    async def seed():
+        async with async_session_maker() as session:
+            conversation = await ConversationService().create_conversation(session, f"user-{uuid.uuid4().hex}")
+            for role, content in [("user", "hi"), ("assistant", "hello"), ("user", "add milk")]:
+                await MessageService().create_message(session, conversation.id, role, content, {"turn": content})
+            await session.commit()
+            return conversation.id
+
+    return run_src(seed())
+
+
+def test_message_defaults_come_from_the_database(conversation_id, run_src):
+    async def read():
+        async with async_session_maker() as session:
+            return await MessageService().get_messages_by_conversation(session, conversation_id)
+
+    messages = run_src(read())
+    assert {m.content for m in messages} == {"hi", "hello", "add milk"}
+    for message in messages:
+        assert uuid.UUID(message.id).version == 7
+        assert message.timestamp is not None
+        assert message.message_metadata == {"turn": message.content}
+
+
+def test_latest_messages_limit(conversation_id, run_src):
+    async def read():
+        async with async_session_maker() as session:
+            return await MessageService().get_latest_messages(session, conversation_id, limit=2)
+
+    assert len(run_src(read())) == 2
+
+
+def test_conversations_load_their_messages(conversation_id, run_src):
+    async def read():
+        async with async_session_maker() as session:
+            conversation = await ConversationService().get_conversation(session, conversation_id)
+            listed = await ConversationService().get_user_conversations_with_messages(session, conversation.user_id)
+            return conversation, listed
+
+    conversation, listed = run_src(read())
+    assert [c.id for c in listed] == [conversation_id]
+    # Loaded by selectinload, so readable after the session has closed
+    assert {m.content for m in listed[0].messages} == {"hi", "hello", "add milk"}
+    assert all(m.conversation_id == conversation_id for m in listed[0].messages)
+
+
+def test_keyset_pages_do_not_skip_messages_with_equal_timestamps(tables, run_src):
+    stamp = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    async def page_through():
+        async with async_session_maker() as session:
+            conversation = await ConversationService().create_conversation(session, f"user-{uuid.uuid4().hex}")
+            session.add_all(
+                Message(conversation_id=conversation.id, role="user", content=str(n), timestamp=stamp)
+                for n in range(5)
+            )
+            await session.commit()
+
+            seen, before = [], None
+            while page := await MessageService().get_latest_messages(session, conversation.id, limit=2, before=before):
+                seen.extend(page)
+                before = (page[-1].timestamp, page[-1].id)
+            return seen
+
+    seen = run_src(page_through())
+    assert sorted(m.content for m in seen) == ["0", "1", "2", "3", "4"]
+    assert [m.id for m in seen] == sorted((m.id for m in seen), reverse=True)
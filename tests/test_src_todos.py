@@ -0,0 +1,94 @@
+import pytest
+
+
+@pytest.fixture
+def owner_and_todo(src_client, auth_headers):
+    owner = auth_headers()
+    response = src_client.post("/api/todos/", json={"title": "mine", "owner_id": "ignored"}, headers=owner)
+    assert response.status_code == 200, response.text
+    return owner, response.json()["id"]
+
+
+def test_unchanged_list_is_not_modified(src_client, owner_and_todo):
+    owner, _ = owner_and_todo
+    first = src_client.get("/api/todos/", headers=owner)
+    assert first.status_code == 200
+    assert [t["title"] for t in first.json()] == ["mine"]
+
+    again = src_client.get("/api/todos/", headers={**owner, "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_edit_within_the_same_second_changes_the_etag(src_client, owner_and_todo):
+    owner, todo_id = owner_and_todo
+    etag = src_client.get("/api/todos/", headers=owner).headers["ETag"]
+
+    # Same row count, same highest id and (at one-second resolution) the same
+    # updated_at: only the body itself tells the two versions apart
+    response = src_client.put(f"/api/todos/{todo_id}", json={"is_completed": True, "owner_id": "ignored"}, headers=owner)
+    assert response.status_code == 200, response.text
+
+    after = src_client.get("/api/todos/", headers={**owner, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.json()[0]["is_completed"] is True
+    assert after.headers["ETag"] != etag
+
+
+def test_owner_can_update_todo(src_client, owner_and_todo):
+    owner, todo_id = owner_and_todo
+    response = src_client.put(f"/api/todos/{todo_id}", json={"title": "renamed", "owner_id": "ignored"}, headers=owner)
+    assert response.status_code == 200, response.text
+    assert response.json()["title"] == "renamed"
+    # Fields left out of the body, and the owner, are unchanged
+    assert response.json()["is_completed"] is False
+    assert response.json()["owner_id"] != "ignored"
+    assert [t["title"] for t in src_client.get("/api/todos/", headers=owner).json()] == ["renamed"]
+
+
+@pytest.mark.parametrize("foreign", [True, False], ids=["foreign", "missing"])
+def test_update_of_foreign_or_missing_todo_is_not_found(src_client, owner_and_todo, foreign, auth_headers):
+    owner, todo_id = owner_and_todo
+    target = todo_id if foreign else todo_id + 10_000
+
+    response = src_client.put(f"/api/todos/{target}", json={"title": "stolen", "owner_id": "ignored"}, headers=auth_headers())
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Todo not found"}
+    assert [t["title"] for t in src_client.get("/api/todos/", headers=owner).json()] == ["mine"]
+
+
+def test_owner_can_delete_todo(src_client, owner_and_todo):
+    owner, todo_id = owner_and_todo
+    response = src_client.delete(f"/api/todos/{todo_id}", headers=owner)
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert src_client.get("/api/todos/", headers=owner).json() == []
+    # A second delete finds nothing
+    assert src_client.delete(f"/api/todos/{todo_id}", headers=owner).status_code == 404
+
+
+@pytest.mark.parametrize("foreign", [True, False], ids=["foreign", "missing"])
+def test_delete_of_foreign_or_missing_todo_is_not_found(src_client, owner_and_todo, foreign, auth_headers):
+    owner, todo_id = owner_and_todo
+    target = todo_id if foreign else todo_id + 10_000
+
+    response = src_client.delete(f"/api/todos/{target}", headers=auth_headers())
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Todo not found"}
+    assert [t["title"] for t in src_client.get("/api/todos/", headers=owner).json()] == ["mine"]
+
+
+def test_client_timestamps_are_ignored(src_client, owner_and_todo):
+    owner, todo_id = owner_and_todo
+    created = src_client.post(
+        "/api/todos/", json={"title": "t", "owner_id": "x", "created_at": "2000-01-01T00:00:00Z"}, headers=owner
+    )
+    assert created.status_code == 200, created.text
+    assert not created.json()["created_at"].startswith("2000")
+
+    response = src_client.put(
+        f"/api/todos/{todo_id}", json={"title": "renamed", "owner_id": "x", "updated_at": None, "created_at": None},
+        headers=owner,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["updated_at"] is not None
@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+
+
+def _signup(client):
+    response = client.post(
+        "/api/auth/signup",
+        json={"email": f"user-{uuid.uuid4().hex}@example.com", "password": "password123"},
+    )
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+@pytest.fixture
+def owner_and_task(client):
+    owner = _signup(client)
+    response = client.post("/api/tasks", json={"title": "mine", "description": "d"}, headers=owner)
+    assert response.status_code == 201, response.text
+    return owner, response.json()["id"]
+
+
+def test_owner_can_read_update_toggle_and_delete(client, owner_and_task):
+    owner, task_id = owner_and_task
+    assert client.get(f"/api/tasks/{task_id}", headers=owner).json()["title"] == "mine"
+    assert client.put(f"/api/tasks/{task_id}", json={"title": "renamed"}, headers=owner).json()["title"] == "renamed"
+    assert client.patch(f"/api/tasks/{task_id}/complete", headers=owner).json()["completed"] is True
+    assert client.delete(f"/api/tasks/{task_id}", headers=owner).status_code == 204
+    assert client.get(f"/api/tasks/{task_id}", headers=owner).status_code == 404
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("GET", "/api/tasks/{id}", None),
+        ("PUT", "/api/tasks/{id}", {"title": "stolen"}),
+        ("PATCH", "/api/tasks/{id}/complete", None),
+        ("DELETE", "/api/tasks/{id}", None),
+    ],
+)
+def test_foreign_task_is_not_found(client, owner_and_task, method, path, body):
+    owner, task_id = owner_and_task
+    stranger = _signup(client)
+
+    response = client.request(method, path.format(id=task_id), json=body, headers=stranger)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Task not found"}
+
+    # The owner's task is untouched
+    task = client.get(f"/api/tasks/{task_id}", headers=owner).json()
+    assert task["title"] == "mine"
+    assert task["completed"] is False
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("GET", "/api/tasks/{id}", None),
+        ("PUT", "/api/tasks/{id}", {"title": "x"}),
+        ("PATCH", "/api/tasks/{id}/complete", None),
+        ("DELETE", "/api/tasks/{id}", None),
+    ],
+)
+def test_missing_task_is_not_found(client, method, path, body):
+    response = client.request(method, path.format(id=999_999), json=body, headers=_signup(client))
+    assert response.status_code == 404